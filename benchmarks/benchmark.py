@@ -0,0 +1,342 @@
+"""
+Time the core conversions, formatting, plotting and full app reruns.
+
+Usage::
+
+    python benchmarks/benchmark.py -o results.json
+    python benchmarks/benchmark.py -o new.json --compare results.json --threshold 0.2
+
+With ``--compare`` the command exits with status 1 if any benchmark median got
+slower than the given relative threshold.
+"""
+
+import argparse
+import datetime
+import json
+import platform
+import statistics
+import subprocess
+import sys
+import time
+import timeit
+import warnings
+from pathlib import Path
+from typing import Callable
+from typing import Optional
+
+ROOT_DIR = Path(__file__).parent.parent
+SRC_DIR = ROOT_DIR / "src"
+if str(SRC_DIR) not in sys.path:
+    sys.path.append(str(SRC_DIR))
+
+import colour
+import numpy
+
+import streamlit_temperature2rgb.core as core
+
+TEMPERATURES = [1000, 1667, 2700, 4000, 6500, 10000, 15000, 20000]
+TINTS = [-150, 0, 150]
+DAYLIGHT_TEMPERATURES = [4000, 5000, 6500, 10000, 15000, 25000]
+BATCH_SIZE = 100000
+
+BENCHMARKS: dict[str, Callable[[], None]] = {}
+
+
+def benchmark(name: str):
+    def _register(function):
+        BENCHMARKS[name] = function
+        return function
+
+    return _register
+
+
+def _get_colorspace():
+    return colour.RGB_COLOURSPACES["sRGB"]
+
+
+def _get_conversion(temperature=6500, tint=0.0, backend="reference"):
+    colorspace = _get_colorspace()
+    return core.PlanckianCCTConversion(
+        CCT=temperature,
+        colorspace=colorspace,
+        illuminant=colorspace.whitepoint,
+        cat="Bradford",
+        tint=tint / 3000,
+        backend=backend,
+    )
+
+
+def _planckian_domain(backend: str):
+    def _run():
+        for temperature in TEMPERATURES:
+            for tint in TINTS:
+                _get_conversion(temperature, tint, backend).rgb_normalized
+
+    return _run
+
+
+benchmark("planckian.domain.reference")(_planckian_domain("reference"))
+benchmark("planckian.domain.lut")(_planckian_domain("lut"))
+
+
+@benchmark("daylight.domain")
+def _daylight_domain():
+    colorspace = _get_colorspace()
+    for temperature in DAYLIGHT_TEMPERATURES:
+        core.DaylightCCTConversion(
+            CCT=temperature,
+            colorspace=colorspace,
+            illuminant=colorspace.whitepoint,
+            cat="Bradford",
+        ).rgb_normalized
+
+
+def _batch(locus: str, backend: str = "reference", dtype=numpy.float64):
+    temperatures = numpy.linspace(1667, 20000, BATCH_SIZE)
+    tints = numpy.linspace(-150, 150, BATCH_SIZE) / 3000
+    colorspace = _get_colorspace()
+    out = None
+    if dtype != numpy.float64:
+        # like successive batches reusing their output arrays
+        out = core.CCTBatchResult(
+            xy=numpy.empty((BATCH_SIZE, 2), dtype=dtype),
+            XYZ=numpy.empty((BATCH_SIZE, 3), dtype=dtype),
+            rgb=numpy.empty((BATCH_SIZE, 3), dtype=dtype),
+        )
+
+    def _run():
+        core.convert_cct_batch(
+            temperatures,
+            colorspace=colorspace,
+            illuminant=colorspace.whitepoint,
+            cat="Bradford",
+            tint=tints,
+            locus=locus,
+            normalize=True,
+            backend=backend,
+            dtype=dtype,
+            out=out,
+        )
+
+    return _run
+
+
+benchmark("batch.planckian.reference")(_batch("Planckian"))
+benchmark("batch.planckian.lut")(_batch("Planckian", backend="lut"))
+benchmark("batch.daylight")(_batch("Daylight"))
+benchmark("batch.planckian.float32")(_batch("Planckian", dtype=numpy.float32))
+benchmark("batch.daylight.float32")(_batch("Daylight", dtype=numpy.float32))
+
+
+@benchmark("image.rgb_array_to_image")
+def _rgb_array_to_image():
+    core.rgb_array_to_image(numpy.array([1.0, 0.5, 0.25]), 100, 19)
+
+
+@benchmark("image.rgb_array_to_png")
+def _rgb_array_to_png():
+    # encoding is cached per color, this times the path the app takes on rerun
+    core.rgb_array_to_png(numpy.array([1.0, 0.5, 0.25]), 100, 19)
+
+
+@benchmark("stringify.all")
+def _stringify():
+    rgb = numpy.array([1.0, 0.372, 0.068])
+    core.rgb_array_to_tuple(rgb, 3)
+    core.rgb_array_to_single_line(rgb, 3)
+    core.xy_array_to_tuple(rgb[:2], 3)
+    core.rgb_array_to_nuke(
+        rgb,
+        3,
+        node_name=core.get_nuke_node_name(6500, "sRGB", False),
+        node_label=core.get_nuke_node_label(6500, "sRGB", False, 0),
+    )
+
+
+@benchmark("stringify.batch")
+def _stringify_batch():
+    rgb = numpy.random.default_rng(0).random((BATCH_SIZE, 3))
+    core.rgb_batch_to_tuple(rgb, 3)
+    core.rgb_batch_to_single_line(rgb, 3)
+    core.xy_batch_to_tuple(rgb[:, :2], 3)
+
+
+@benchmark("stringify.batch.float32")
+def _stringify_batch_float32():
+    rgb = numpy.random.default_rng(0).random((BATCH_SIZE, 3), dtype=numpy.float32)
+    core.rgb_batch_to_tuple(rgb, 3)
+    core.rgb_batch_to_single_line(rgb, 3)
+
+
+@benchmark("plot.plot_cct_conversion")
+def _plot_cct_conversion():
+    figure, _ = core.plot_cct_conversion(_get_conversion())
+    core.render_figure(figure)
+    core.release_figure(figure)
+
+
+@benchmark("plot.render_cct_conversion")
+def _render_cct_conversion():
+    _render_cct_conversion.counter = getattr(_render_cct_conversion, "counter", 0) + 1
+    core.render_cct_conversion(_get_conversion(1000 + _render_cct_conversion.counter))
+
+
+def _get_app_test():
+    from streamlit.testing.v1 import AppTest
+
+    return AppTest.from_file(str(SRC_DIR / "app.py"), default_timeout=120)
+
+
+@benchmark("app.new_session")
+def _app_new_session():
+    app = _get_app_test().run()
+    if app.exception:
+        raise RuntimeError(app.exception)
+
+
+@benchmark("app.rerun")
+def _app_rerun():
+    if not hasattr(_app_rerun, "app"):
+        _app_rerun.app = _get_app_test().run()
+        _app_rerun.counter = 0
+    # change the temperature so the rerun has something to compute
+    _app_rerun.counter += 1
+    slider = _app_rerun.app.slider(key="widget_temperature_slider")
+    slider.set_value(1000.0 + _app_rerun.counter % 10000).run()
+    if _app_rerun.app.exception:
+        raise RuntimeError(_app_rerun.app.exception)
+
+
+def run_benchmark(function: Callable, repeat: int, min_time: float) -> dict:
+    """
+    Time the function like ``timeit`` does: find a number of calls lasting at
+    least ``min_time`` seconds, then repeat it.
+
+    Returns:
+        statistics in seconds per call.
+    """
+    timer = timeit.Timer(function)
+    number = 1
+    while True:
+        duration = timer.timeit(number)
+        if duration >= min_time:
+            break
+        number *= 2 if duration == 0 else max(2, int(min_time / duration * 1.2))
+
+    timings = [time / number for time in timer.repeat(repeat=repeat, number=number)]
+    return {
+        "median": statistics.median(timings),
+        "min": min(timings),
+        "max": max(timings),
+        "number": number,
+        "repeat": repeat,
+    }
+
+
+def _get_commit() -> Optional[str]:
+    try:
+        return subprocess.check_output(
+            ["git", "rev-parse", "HEAD"], cwd=ROOT_DIR, text=True
+        ).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def get_metadata() -> dict:
+    import matplotlib
+    import streamlit
+
+    return {
+        "commit": _get_commit(),
+        "date": datetime.datetime.now(datetime.timezone.utc).isoformat(),
+        "platform": platform.platform(),
+        "python": platform.python_version(),
+        "numpy": numpy.__version__,
+        "colour": colour.__version__,
+        "matplotlib": matplotlib.__version__,
+        "streamlit": streamlit.__version__,
+    }
+
+
+def compare(results: dict, baseline: dict, threshold: float) -> list[str]:
+    """
+    Print the ratio of each median to the baseline one.
+
+    Returns:
+        names of the benchmarks slower than ``1 + threshold`` times the baseline.
+    """
+    regressions = []
+    print(f"\n{'benchmark':<32} {'baseline':>12} {'current':>12} {'ratio':>8}")
+    for name, result in results["results"].items():
+        base = baseline["results"].get(name)
+        if base is None:
+            print(f"{name:<32} {'-':>12} {result['median'] * 1000:>10.3f}ms")
+            continue
+        ratio = result["median"] / base["median"]
+        flag = ""
+        if ratio > 1 + threshold:
+            regressions.append(name)
+            flag = "  REGRESSION"
+        print(
+            f"{name:<32} {base['median'] * 1000:>10.3f}ms "
+            f"{result['median'] * 1000:>10.3f}ms {ratio:>8.2f}{flag}"
+        )
+    return regressions
+
+
+def get_cli(argv: Optional[list[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("-o", "--output", type=Path, help="JSON file to write.")
+    parser.add_argument(
+        "-k",
+        "--filter",
+        default="",
+        help="only run the benchmarks whose name contains this string.",
+    )
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument(
+        "--min-time",
+        type=float,
+        default=0.2,
+        help="minimal duration in seconds of a single repeat.",
+    )
+    parser.add_argument("--compare", type=Path, help="JSON file of a previous run.")
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=0.2,
+        help="relative slowdown considered a regression, 0.2 means 20%%.",
+    )
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[list[str]] = None):
+    cli = get_cli(argv)
+    warnings.filterwarnings("ignore")
+    colour.utilities.filter_warnings(colour_usage_warnings=True, python_warnings=True)
+
+    results = {"metadata": get_metadata(), "results": {}}
+    for name, function in BENCHMARKS.items():
+        if cli.filter not in name:
+            continue
+        start = time.perf_counter()
+        result = run_benchmark(function, repeat=cli.repeat, min_time=cli.min_time)
+        results["results"][name] = result
+        print(
+            f"{name:<32} {result['median'] * 1000:>10.3f}ms "
+            f"(x{result['number']}, {time.perf_counter() - start:.1f}s)"
+        )
+
+    if cli.output:
+        cli.output.write_text(json.dumps(results, indent=4), encoding="utf-8")
+
+    if cli.compare:
+        baseline = json.loads(cli.compare.read_text(encoding="utf-8"))
+        regressions = compare(results, baseline, cli.threshold)
+        if regressions:
+            print(f"\n{len(regressions)} regression(s): {', '.join(regressions)}")
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
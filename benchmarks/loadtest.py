@@ -0,0 +1,442 @@
+"""
+Drive concurrent simulated users through the app and report rerun latencies,
+throughput and memory.
+
+A local streamlit server is started on ``src/app.py``, unless ``--url`` is given,
+then each session connects to it like a browser does and keeps changing the
+temperature, tint, colorspace and locus, while polling the plot like the
+browser.
+
+Usage::
+
+    python benchmarks/loadtest.py --sessions 8 --duration 60 -o load.json
+    python benchmarks/loadtest.py --url ws://replica:8501 --sessions 32
+
+Each session waits for a rerun to finish before sending the next one, and drags
+sliders with several reruns in a row. Memory is the resident memory of the
+started server, unknown with ``--url``.
+"""
+
+import argparse
+import asyncio
+import dataclasses
+import json
+import os
+import random
+import socket
+import subprocess
+import sys
+import time
+import urllib.request
+from pathlib import Path
+from typing import Optional
+
+import numpy
+from streamlit.proto.BackMsg_pb2 import BackMsg
+from streamlit.proto.ForwardMsg_pb2 import ForwardMsg
+from streamlit.proto.WidgetStates_pb2 import WidgetState
+from websockets.asyncio.client import connect
+
+from benchmark import SRC_DIR
+from benchmark import get_metadata
+
+PERCENTILES = (50, 95, 99)
+
+ACTIONS = {
+    "temperature": 0.5,
+    "tint": 0.2,
+    "colorspace": 0.15,
+    "locus": 0.15,
+}
+"""
+Relative frequency of the user actions.
+"""
+
+DRAG_EVENTS = (3, 8)
+"""
+Minimum and maximum number of reruns sent while dragging a slider.
+"""
+
+DRAG_INTERVAL = 0.05
+"""
+Seconds between two reruns sent while dragging a slider.
+"""
+
+
+@dataclasses.dataclass
+class RerunResult:
+    duration: float
+    status: int
+    errors: list[str]
+
+
+class SimulatedSession:
+    """
+    A single user of the app, talking the browser websocket protocol.
+
+    Args:
+        url: websocket url of the streamlit server, like ``ws://127.0.0.1:8501``
+        rng: source of the user actions
+        think_time: mean seconds between two user actions
+    """
+
+    def __init__(self, url: str, rng: random.Random, think_time: float):
+        self.url = url.rstrip("/") + "/_stcore/stream"
+        self.rng = rng
+        self.think_time = think_time
+        self.latencies: dict[str, list[float]] = {}
+        self.errors: list[str] = []
+        self._websocket = None
+        # last element received for each widget, by widget key
+        self._widgets: dict[str, tuple[str, str, object]] = {}
+        self._polls: dict[str, float] = {}
+
+    async def open(self):
+        self._websocket = await connect(
+            self.url, subprotocols=["streamlit"], max_size=None
+        )
+        await self._record("new_session", [], "")
+
+    async def close(self):
+        if self._websocket is not None:
+            await self._websocket.close()
+
+    async def _rerun(self, states: list[WidgetState], fragment_id: str) -> RerunResult:
+        message = BackMsg()
+        message.rerun_script.page_script_hash = ""
+        message.rerun_script.fragment_id = fragment_id
+        message.rerun_script.widget_states.widgets.extend(states)
+
+        start = time.perf_counter()
+        await self._websocket.send(message.SerializeToString())
+        errors = []
+        while True:
+            forward = ForwardMsg()
+            forward.ParseFromString(await self._websocket.recv())
+            kind = forward.WhichOneof("type")
+            if kind == "delta" and forward.delta.WhichOneof("type") == "new_element":
+                element = forward.delta.new_element
+                element_type = element.WhichOneof("type")
+                content = getattr(element, element_type)
+                if element_type == "exception":
+                    errors.append(content.message)
+                widget_id = getattr(content, "id", "")
+                if widget_id:
+                    key = widget_id.rsplit("-", 1)[-1]
+                    self._widgets[key] = (widget_id, forward.delta.fragment_id, content)
+            elif kind == "auto_rerun":
+                self._polls[forward.auto_rerun.fragment_id] = (
+                    forward.auto_rerun.interval
+                )
+            elif kind == "stop_auto_rerun":
+                for fragment_id in forward.stop_auto_rerun.fragment_ids:
+                    self._polls.pop(fragment_id, None)
+            elif (
+                kind == "new_session" and not forward.new_session.fragment_ids_this_run
+            ):
+                # like the browser, a full rerun stops every auto-rerun
+                self._polls.clear()
+            elif kind == "script_finished":
+                # the app requested a rerun, it is part of this one
+                if forward.script_finished == ForwardMsg.FINISHED_EARLY_FOR_RERUN:
+                    continue
+                duration = time.perf_counter() - start
+                return RerunResult(duration, forward.script_finished, errors)
+
+    async def _record(self, name: str, states: list[WidgetState], fragment_id: str):
+        result = await self._rerun(states, fragment_id)
+        self.latencies.setdefault(name, []).append(result.duration)
+        self.errors.extend(result.errors)
+
+    def _set_widget(self, key: str, value) -> tuple[list[WidgetState], str]:
+        widget_id, fragment_id, _ = self._widgets[key]
+        state = WidgetState(id=widget_id)
+        if isinstance(value, str):
+            state.string_value = value
+        else:
+            state.double_array_value.data[:] = [value]
+        return [state], fragment_id
+
+    async def _drag(self, name: str, key: str, step: float):
+        slider = self._widgets[key][2]
+        value = self.rng.uniform(slider.min, slider.max)
+        for _ in range(self.rng.randint(*DRAG_EVENTS)):
+            value = min(slider.max, max(slider.min, value + self.rng.gauss(0, step)))
+            value = round(value / slider.step) * slider.step
+            await self._record(name, *self._set_widget(key, value))
+            await asyncio.sleep(DRAG_INTERVAL)
+
+    async def _choose(self, name: str, key: str):
+        selectbox = self._widgets[key][2]
+        value = self.rng.choice(list(selectbox.options))
+        await self._record(name, *self._set_widget(key, value))
+
+    async def act(self):
+        """
+        Perform a random user action.
+        """
+        action = self.rng.choices(list(ACTIONS), weights=list(ACTIONS.values()))[0]
+        if action == "tint" and self._widgets["widget_tint_slider"][2].disabled:
+            action = "temperature"
+
+        if action == "temperature":
+            await self._drag(action, "widget_temperature_slider", step=300.0)
+        elif action == "tint":
+            await self._drag(action, "widget_tint_slider", step=15.0)
+        elif action == "colorspace":
+            await self._choose(action, "widget_colorspace_name")
+        else:
+            await self._choose(action, "widget_locus")
+
+    async def run(self, duration: float):
+        """
+        Act and poll the auto-rerun fragments until ``duration`` seconds elapsed.
+        """
+        end = time.monotonic() + duration
+        next_action = time.monotonic() + self.rng.expovariate(1 / self.think_time)
+        next_polls = {fragment: time.monotonic() for fragment in self._polls}
+        while True:
+            now = time.monotonic()
+            if now >= end:
+                return
+            for fragment in self._polls:
+                next_polls.setdefault(fragment, now + self._polls[fragment])
+            due = min([next_action, *next_polls.values()])
+            if due > now:
+                await asyncio.sleep(min(due, end) - now)
+                continue
+
+            if next_action <= now:
+                await self.act()
+                next_action = time.monotonic() + self.rng.expovariate(
+                    1 / self.think_time
+                )
+                continue
+
+            fragment = min(next_polls, key=next_polls.get)
+            del next_polls[fragment]
+            if fragment in self._polls:
+                await self._record("poll", [], fragment)
+
+
+def get_free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def start_server(port: int, timeout: float = 60.0) -> subprocess.Popen:
+    """
+    Start a headless streamlit server on the app and wait for it to be healthy.
+    """
+    process = subprocess.Popen(
+        [
+            sys.executable,
+            "-m",
+            "streamlit",
+            "run",
+            str(SRC_DIR / "app.py"),
+            "--server.headless=true",
+            f"--server.port={port}",
+            "--server.address=127.0.0.1",
+            "--browser.gatherUsageStats=false",
+        ],
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if process.poll() is not None:
+            raise RuntimeError(f"streamlit server exited with {process.returncode}")
+        try:
+            with urllib.request.urlopen(f"http://127.0.0.1:{port}/_stcore/health"):
+                return process
+        except OSError:
+            time.sleep(0.2)
+    process.terminate()
+    raise TimeoutError(f"streamlit server not ready after {timeout}s")
+
+
+def get_rss(pid: int) -> Optional[int]:
+    """
+    Returns:
+        resident memory of the process in bytes, None if unknown (Linux only).
+    """
+    try:
+        with open(f"/proc/{pid}/statm", encoding="ascii") as file:
+            return int(file.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError):
+        return None
+
+
+def get_statistics(latencies: list[float]) -> dict:
+    """
+    Returns:
+        count and percentiles in seconds.
+    """
+    if not latencies:
+        return {"count": 0}
+    values = numpy.percentile(latencies, PERCENTILES)
+    return {
+        "count": len(latencies),
+        **{f"p{p}": float(value) for p, value in zip(PERCENTILES, values)},
+    }
+
+
+async def run_load(
+    url: str,
+    sessions: int,
+    duration: float,
+    think_time: float,
+    seed: int,
+    pid: Optional[int] = None,
+) -> dict:
+    """
+    Returns:
+        latency statistics per action, throughput and memory of the load test.
+    """
+    # a first session so imports and process-wide caches aren't counted as the
+    # memory of the measured sessions
+    warmup = SimulatedSession(url, random.Random(seed), think_time)
+    await warmup.open()
+    await warmup.close()
+    rss_idle = get_rss(pid) if pid else None
+
+    users = [
+        SimulatedSession(url, random.Random(seed + index + 1), think_time)
+        for index in range(sessions)
+    ]
+    await asyncio.gather(*(user.open() for user in users))
+    rss_open = get_rss(pid) if pid else None
+
+    start = time.perf_counter()
+    await asyncio.gather(*(user.run(duration) for user in users))
+    elapsed = time.perf_counter() - start
+    rss_end = get_rss(pid) if pid else None
+    await asyncio.gather(*(user.close() for user in users))
+
+    latencies: dict[str, list[float]] = {}
+    for user in users:
+        for name, values in user.latencies.items():
+            latencies.setdefault(name, []).extend(values)
+    actions = [name for name in latencies if name not in ("new_session", "poll")]
+    reruns = [value for name in actions for value in latencies[name]]
+    polls = latencies.get("poll", [])
+
+    def _per_session(rss: Optional[int]) -> Optional[float]:
+        if rss is None or rss_idle is None:
+            return None
+        return (rss - rss_idle) / sessions
+
+    return {
+        "sessions": sessions,
+        "duration": elapsed,
+        "latencies": {
+            "user_reruns": get_statistics(reruns),
+            **{name: get_statistics(values) for name, values in latencies.items()},
+        },
+        "throughput": {
+            "user_reruns": len(reruns) / elapsed,
+            "all_reruns": (len(reruns) + len(polls)) / elapsed,
+        },
+        "memory": {
+            "idle_rss": rss_idle,
+            "rss_after_open": rss_open,
+            "rss_after_load": rss_end,
+            "per_session_after_open": _per_session(rss_open),
+            "per_session_after_load": _per_session(rss_end),
+        },
+        "errors": [error for user in users for error in user.errors],
+    }
+
+
+def print_report(report: dict):
+    print(
+        f"\n{report['sessions']} sessions for {report['duration']:.1f}s, "
+        f"{len(report['errors'])} error(s)"
+    )
+    header = "".join(f"{f'p{p} ms':>10}" for p in PERCENTILES)
+    print(f"{'rerun':<16}{'count':>8}{header}")
+    for name, statistics in report["latencies"].items():
+        if not statistics["count"]:
+            continue
+        percentiles = "".join(
+            f"{statistics[f'p{p}'] * 1000:>10.1f}" for p in PERCENTILES
+        )
+        print(f"{name:<16}{statistics['count']:>8}{percentiles}")
+
+    throughput = report["throughput"]
+    print(
+        f"\nthroughput: {throughput['user_reruns']:.1f} user reruns/s, "
+        f"{throughput['all_reruns']:.1f} reruns/s with the plot polls"
+    )
+    memory = report["memory"]
+    if memory["idle_rss"] is not None:
+        mib = 1024 * 1024
+        print(
+            f"memory: {memory['idle_rss'] / mib:.0f}MiB idle, "
+            f"{memory['rss_after_load'] / mib:.0f}MiB after the load, "
+            f"{memory['per_session_after_open'] / mib:.1f}MiB per session opened, "
+            f"{memory['per_session_after_load'] / mib:.1f}MiB after the load"
+        )
+
+
+def get_cli(argv: Optional[list[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("-o", "--output", type=Path, help="JSON file to write.")
+    parser.add_argument("-n", "--sessions", type=int, default=8)
+    parser.add_argument(
+        "--duration",
+        type=float,
+        default=30.0,
+        help="seconds the sessions are active, after they are all opened.",
+    )
+    parser.add_argument(
+        "--think-time",
+        type=float,
+        default=1.0,
+        help="mean seconds between two actions of a user.",
+    )
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument(
+        "--url",
+        help="websocket url of a running server, like ws://127.0.0.1:8501, "
+        "instead of starting one.",
+    )
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[list[str]] = None):
+    cli = get_cli(argv)
+
+    process = None
+    url = cli.url
+    if url is None:
+        port = get_free_port()
+        process = start_server(port)
+        url = f"ws://127.0.0.1:{port}"
+
+    try:
+        report = asyncio.run(
+            run_load(
+                url,
+                sessions=cli.sessions,
+                duration=cli.duration,
+                think_time=cli.think_time,
+                seed=cli.seed,
+                pid=process.pid if process else None,
+            )
+        )
+    finally:
+        if process is not None:
+            process.terminate()
+            process.wait()
+
+    print_report(report)
+    if cli.output:
+        results = {"metadata": get_metadata(), **report}
+        cli.output.write_text(json.dumps(results, indent=4), encoding="utf-8")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,15 +1,14 @@
+import gc
 import sys
+import time
 from pathlib import Path
 
-import colour.utilities
 import streamlit
 
 THIS_DIR = Path(__file__).parent
 if str(THIS_DIR) not in sys.path:
     sys.path.append(str(THIS_DIR))
 
-import streamlit_temperature2rgb
-
 streamlit.set_page_config(
     page_title="Temperature2RGB",
     page_icon=":thermometer:",
@@ -17,7 +16,32 @@ streamlit.set_page_config(
     initial_sidebar_state="expanded",
 )
 
+# importing colour takes seconds in a fresh process, so only do it once the page
+# config has been sent, and let the user know something is happening.
+if "streamlit_temperature2rgb" not in sys.modules:
+    with streamlit.spinner("Loading ..."):
+        import_start = time.perf_counter()
+        import streamlit_temperature2rgb
+
+        # streamlit collects the garbage after every rerun, which takes ~90ms with
+        # the objects of those imports: exclude them from it, they live forever.
+        gc.freeze()
+        streamlit_temperature2rgb.ui.record_boot_timing(
+            "import", time.perf_counter() - import_start
+        )
+
+# already imported at that point, this just binds the names for this script run
+import colour.utilities
+import streamlit_temperature2rgb
+
 colour.utilities.filter_warnings(colour_usage_warnings=True, python_warnings=True)
+# opt-in with the TEMPERATURE2RGB_WARMUP environment variable
+streamlit_temperature2rgb.ui.start_warmup()
 # we create a first instance of the config at startup
 streamlit_temperature2rgb.ui.config(force_instance=True)
+
+render_start = time.perf_counter()
 streamlit_temperature2rgb.create_main_interface()
+streamlit_temperature2rgb.ui.record_boot_timing(
+    "first_render", time.perf_counter() - render_start
+)
@@ -0,0 +1,239 @@
+import collections
+import contextlib
+import dataclasses
+import os
+import sys
+import threading
+import time
+from typing import Callable
+from typing import Iterator
+from typing import Optional
+from typing import TypeVar
+
+import numpy
+
+T = TypeVar("T")
+
+PERCENTILES = (50, 90, 95, 99)
+
+
+@dataclasses.dataclass
+class StageRecord:
+    name: str
+    start: float = 0.0
+    duration: float = 0.0
+    cached: Optional[bool] = None
+    """
+    None if the stage doesn't involve a cache, else True if it was served by it.
+    """
+
+    def track(self, compute: Callable[[], T]) -> Callable[[], T]:
+        """
+        Wrap a cache ``compute`` function so the record knows if it had to be called.
+        """
+        self.cached = True
+
+        def _compute():
+            self.cached = False
+            return compute()
+
+        return _compute
+
+
+class _StageStatistics:
+    def __init__(self, window: int):
+        self.count = 0
+        self.total = 0.0
+        self.hits = 0
+        self.misses = 0
+        self.durations = collections.deque(maxlen=window)
+
+
+class StageMetrics:
+    """
+    Process-wide aggregation of stage durations, safe to share between sessions.
+
+    Percentiles are computed on the last ``window`` durations of each stage.
+    """
+
+    def __init__(self, window: int = 2048):
+        self.window = window
+        self._stages: dict[str, _StageStatistics] = {}
+        self._lock = threading.Lock()
+
+    def record(self, record: StageRecord):
+        with self._lock:
+            statistics = self._stages.get(record.name)
+            if statistics is None:
+                statistics = self._stages[record.name] = _StageStatistics(self.window)
+            statistics.count += 1
+            statistics.total += record.duration
+            statistics.durations.append(record.duration)
+            if record.cached is True:
+                statistics.hits += 1
+            elif record.cached is False:
+                statistics.misses += 1
+
+    def snapshot(self) -> dict[str, dict]:
+        """
+        Returns:
+            mapping of stage name to its count, sum and percentiles in seconds
+            and cache hits/misses.
+        """
+        with self._lock:
+            stages = {
+                name: (s.count, s.total, s.hits, s.misses, list(s.durations))
+                for name, s in self._stages.items()
+            }
+
+        snapshot = {}
+        for name, (count, total, hits, misses, durations) in sorted(stages.items()):
+            percentiles = numpy.percentile(durations, PERCENTILES)
+            snapshot[name] = {
+                "count": count,
+                "sum": total,
+                "hits": hits,
+                "misses": misses,
+                **{f"p{p}": float(v) for p, v in zip(PERCENTILES, percentiles)},
+            }
+        return snapshot
+
+    def clear(self):
+        with self._lock:
+            self._stages.clear()
+
+
+METRICS = StageMetrics()
+"""
+Metrics of the stages of all the app reruns of this process.
+"""
+
+
+class StageTimer:
+    """
+    Record the duration of named stages, usually those of a single rerun.
+
+    Stages can be nested, their name is then prefixed by their parents
+    ones like ``rerun.display.plot``.
+
+    Args:
+        metrics: where to also aggregate the records, None to only keep them
+            in this timer.
+    """
+
+    def __init__(self, metrics: Optional[StageMetrics] = None):
+        self.records: list[StageRecord] = []
+        self._metrics = metrics
+        self._stack: list[str] = []
+
+    @contextlib.contextmanager
+    def stage(self, name: str) -> Iterator[StageRecord]:
+        record = StageRecord(name=".".join([*self._stack, name]))
+        self._stack.append(name)
+        record.start = time.perf_counter()
+        try:
+            yield record
+        finally:
+            record.duration = time.perf_counter() - record.start
+            self._stack.pop()
+            self.records.append(record)
+            if self._metrics is not None:
+                self._metrics.record(record)
+
+    def get_records(self) -> list[StageRecord]:
+        """
+        Returns:
+            records in the order the stages started.
+        """
+        return sorted(self.records, key=lambda record: record.start)
+
+
+def get_memory_usage() -> dict[str, int]:
+    """
+    Returns:
+        resident memory of the process and its peak, in bytes. The current value
+        is only available on Linux, the peak is used instead elsewhere.
+    """
+    try:
+        import resource
+    except ImportError:  # windows
+        return {}
+
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # kilobytes on Linux, bytes on macOS
+    peak = peak if sys.platform == "darwin" else peak * 1024
+    try:
+        with open("/proc/self/statm", encoding="ascii") as file:
+            resident = int(file.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError):
+        resident = peak
+    return {"rss": resident, "peak_rss": max(peak, resident)}
+
+
+def _escape_label(value) -> str:
+    value = str(value).replace("\\", "\\\\").replace('"', '\\"')
+    return value.replace("\n", "\\n")
+
+
+def to_prometheus_metric(
+    name: str,
+    metric_type: str,
+    description: str,
+    samples: list[tuple[dict[str, str], float]],
+) -> str:
+    """
+    Format a metric in the Prometheus text exposition format.
+
+    Args:
+        name: metric name, suffixed with the sample suffix if any
+        metric_type: "counter", "gauge", "summary", ...
+        description: one line help
+        samples: tuple of ``(labels, value)``, a ``__suffix__`` label is appended
+            to the metric name instead.
+    """
+    lines = [f"# HELP {name} {description}", f"# TYPE {name} {metric_type}"]
+    for labels, value in samples:
+        labels = dict(labels)
+        suffix = labels.pop("__suffix__", "")
+        label_str = ",".join(
+            f'{key}="{_escape_label(label)}"' for key, label in labels.items()
+        )
+        label_str = f"{{{label_str}}}" if label_str else ""
+        lines.append(f"{name}{suffix}{label_str} {value!r}")
+    return "\n".join(lines) + "\n"
+
+
+def stage_metrics_to_prometheus(
+    snapshot: dict[str, dict],
+    prefix: str = "temperature2rgb",
+) -> str:
+    """
+    Args:
+        snapshot: as returned by ``StageMetrics.snapshot``
+        prefix: prepended to the metrics names
+    """
+    durations = []
+    cache = []
+    for stage, statistics in snapshot.items():
+        for percentile in PERCENTILES:
+            labels = {"stage": stage, "quantile": str(percentile / 100)}
+            durations.append((labels, statistics[f"p{percentile}"]))
+        durations.append(({"stage": stage, "__suffix__": "_sum"}, statistics["sum"]))
+        durations.append(
+            ({"stage": stage, "__suffix__": "_count"}, statistics["count"])
+        )
+        if statistics["hits"] or statistics["misses"]:
+            cache.append(({"stage": stage, "result": "hit"}, statistics["hits"]))
+            cache.append(({"stage": stage, "result": "miss"}, statistics["misses"]))
+
+    return to_prometheus_metric(
+        f"{prefix}_stage_duration_seconds",
+        "summary",
+        "Duration of the app stages.",
+        durations,
+    ) + to_prometheus_metric(
+        f"{prefix}_stage_cache_total",
+        "counter",
+        "Stages served from a cache or computed.",
+        cache,
+    )
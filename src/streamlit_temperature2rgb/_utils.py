@@ -1,6 +1,15 @@
+import collections
+import dataclasses
 import enum
+import threading
+from typing import Callable
+from typing import Any
+from typing import Hashable
+from typing import TypeVar
 from typing import Union
 
+T = TypeVar("T")
+
 
 class NamedFunction:
     """
@@ -98,3 +107,119 @@ def python_to_markdown_table(
         markdown_table += "|\n"
 
     return markdown_table
+
+
+@dataclasses.dataclass(frozen=True)
+class CacheStats:
+    hits: int
+    misses: int
+    evictions: int
+    size: int
+    maxsize: int
+
+
+class LRUCache:
+    """
+    A bounded mapping that evicts the least recently used entry once full.
+
+    Safe to share between threads, so between streamlit sessions.
+
+    Args:
+        maxsize: maximum number of entries stored.
+    """
+
+    def __init__(self, maxsize: int = 128):
+        self.maxsize = maxsize
+        self._data: collections.OrderedDict = collections.OrderedDict()
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+
+    def __len__(self):
+        return len(self._data)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._data
+
+    def get(self, key: Hashable, default=None):
+        """
+        Return the value stored for key, else default without counting a miss.
+        """
+        with self._lock:
+            if key not in self._data:
+                return default
+            self._hits += 1
+            self._data.move_to_end(key)
+            return self._data[key]
+
+    def get_or_compute(self, key: Hashable, compute: Callable[[], T]) -> T:
+        """
+        Return the value stored for key, calling ``compute`` to create it if missing.
+
+        ``compute`` is called outside the lock so concurrent misses on different
+        keys don't block each other.
+        """
+        with self._lock:
+            if key in self._data:
+                self._hits += 1
+                self._data.move_to_end(key)
+                return self._data[key]
+            self._misses += 1
+
+        value = compute()
+        self.put(key, value)
+        return value
+
+    def put(self, key: Hashable, value):
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+                self._evictions += 1
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+            self._hits = 0
+            self._misses = 0
+            self._evictions = 0
+
+    def stats(self) -> CacheStats:
+        with self._lock:
+            return CacheStats(
+                hits=self._hits,
+                misses=self._misses,
+                evictions=self._evictions,
+                size=len(self._data),
+                maxsize=self.maxsize,
+            )
+
+
+class StageCache:
+    """
+    Remember the last output of named computation stages with the inputs that
+    produced it, so a stage is only recomputed when its inputs changed.
+    """
+
+    def __init__(self):
+        self._stages: dict[str, tuple[Hashable, Any]] = {}
+
+    def get(self, name: str, inputs: Hashable, compute: Callable[[], T]) -> T:
+        """
+        Args:
+            name: unique identifier of the stage
+            inputs: everything the stage output depends on, compared by equality.
+            compute: create the stage output when the inputs changed.
+        """
+        previous = self._stages.get(name)
+        if previous is not None and previous[0] == inputs:
+            return previous[1]
+
+        value = compute()
+        self._stages[name] = (inputs, value)
+        return value
+
+    def clear(self):
+        self._stages.clear()
@@ -0,0 +1,4 @@
+from ._main import ConversionOptions
+from ._main import convert_lines
+from ._main import convert_stream
+from ._main import main
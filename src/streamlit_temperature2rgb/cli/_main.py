@@ -0,0 +1,341 @@
+import argparse
+import collections
+import concurrent.futures
+import dataclasses
+import itertools
+import os
+import re
+import sys
+from typing import Iterable
+from typing import Iterator
+from typing import Optional
+from typing import TextIO
+
+import colour
+import numpy
+
+from streamlit_temperature2rgb.core import LOCI
+from streamlit_temperature2rgb.core import PLANCKIAN_BACKENDS
+from streamlit_temperature2rgb.core import convert_cct_batch
+from streamlit_temperature2rgb.core import get_float32_deviation
+from streamlit_temperature2rgb.core import get_nuke_node_label
+from streamlit_temperature2rgb.core import get_nuke_node_name
+from streamlit_temperature2rgb.core import get_whitepoint
+from streamlit_temperature2rgb.core import rgb_batch_to_nuke
+from streamlit_temperature2rgb.core import rgb_batch_to_single_line
+from streamlit_temperature2rgb.core import rgb_batch_to_tuple
+from streamlit_temperature2rgb.core import xy_batch_to_tuple
+
+OUTPUT_FORMATS = ("tuple", "katana", "nuke", "xy")
+
+DTYPES = ("float64", "float32")
+
+_SEPARATOR_REGEX = re.compile(r"[,;\s]+")
+
+
+@dataclasses.dataclass(frozen=True)
+class ConversionOptions:
+    """
+    Same options as the app sidebar, tint being in the app units (-150..150).
+    """
+
+    colorspace: str = "sRGB"
+    illuminant: Optional[str] = None
+    cat: str = "Bradford"
+    locus: str = "Planckian"
+    normalize: bool = True
+    ndecimals: int = 3
+    output_format: str = "tuple"
+    backend: str = "reference"
+    dtype: str = "float64"
+
+
+def _parse_row(line: str, line_number: int) -> tuple[float, float]:
+    fields = _SEPARATOR_REGEX.split(line.strip())
+    if len(fields) > 2:
+        raise ValueError(
+            f"line {line_number}: expected 'temperature[,tint]', got {line!r}"
+        )
+    try:
+        temperature = float(fields[0])
+        tint = float(fields[1]) if len(fields) == 2 else 0.0
+    except ValueError:
+        raise ValueError(f"line {line_number}: cannot parse {line!r} as numbers")
+    return temperature, tint
+
+
+def convert_lines(
+    lines: list[tuple[int, str]],
+    options: ConversionOptions,
+) -> str:
+    """
+    Convert a chunk of input rows to the requested output format.
+
+    Args:
+        lines: tuples of ``(line number, "temperature[,tint]")``.
+        options: how to convert and format
+
+    Returns:
+        formatted output for all the lines, one entry per line.
+    """
+    rows = numpy.array(
+        [_parse_row(line, line_number) for line_number, line in lines],
+        dtype=numpy.float64,
+    ).reshape(-1, 2)
+    temperatures = rows[:, 0]
+    tints = rows[:, 1]
+
+    colorspace: colour.RGB_Colourspace = colour.RGB_COLOURSPACES[options.colorspace]
+    result = convert_cct_batch(
+        temperatures,
+        colorspace=colorspace,
+        illuminant=get_whitepoint(options.illuminant, colorspace),
+        cat=options.cat,
+        tint=tints / 3000,
+        locus=options.locus,
+        normalize=options.normalize,
+        backend=options.backend,
+        dtype=options.dtype,
+    )
+
+    use_daylight = options.locus == "Daylight"
+    ndecimals = options.ndecimals
+    if options.output_format == "tuple":
+        output = rgb_batch_to_tuple(result.rgb, ndecimals)
+    elif options.output_format == "katana":
+        output = rgb_batch_to_single_line(result.rgb, ndecimals)
+    elif options.output_format == "xy":
+        output = xy_batch_to_tuple(result.xy, ndecimals)
+    elif options.output_format == "nuke":
+        output = rgb_batch_to_nuke(
+            result.rgb,
+            ndecimals,
+            node_names=[
+                get_nuke_node_name(temperature, options.colorspace, use_daylight)
+                for temperature in temperatures.tolist()
+            ],
+            node_labels=[
+                get_nuke_node_label(temperature, options.colorspace, use_daylight, tint)
+                for temperature, tint in zip(temperatures.tolist(), tints.tolist())
+            ],
+        )
+    else:
+        raise ValueError(f"Unsupported output format {options.output_format!r}")
+
+    return output + "\n"
+
+
+def read_chunks(
+    stream: Iterable[str],
+    chunk_size: int,
+) -> Iterator[list[tuple[int, str]]]:
+    """
+    Lazily split the input in chunks of rows, skipping empty lines, comments
+    starting with ``#`` and a header on the first line.
+    """
+    rows = enumerate(stream, start=1)
+    for line_number, line in rows:
+        if line.strip() and not line.lstrip().startswith("#"):
+            break
+    else:
+        return
+
+    # the first row is a header if it doesn't start with a number
+    if re.match(r"\s*[-+.\d]", line):
+        rows = itertools.chain([(line_number, line)], rows)
+
+    rows = (
+        (line_number, line)
+        for line_number, line in rows
+        if line.strip() and not line.lstrip().startswith("#")
+    )
+    while chunk := list(itertools.islice(rows, chunk_size)):
+        yield chunk
+
+
+def convert_stream(
+    input_stream: Iterable[str],
+    output_stream: TextIO,
+    options: ConversionOptions,
+    chunk_size: int = 50000,
+    workers: int = 1,
+):
+    """
+    Convert all the rows of the input and write them to the output as soon as
+    they are available, in the input order.
+
+    At most ``2 * workers`` chunks are held in memory at once.
+
+    Args:
+        input_stream: lines of ``temperature[,tint]``
+        output_stream: where to write the formatted results
+        options: how to convert and format
+        chunk_size: number of rows converted at once by a worker
+        workers: number of processes to use, 1 to convert in the current process.
+    """
+    chunks = read_chunks(input_stream, chunk_size)
+
+    if workers <= 1:
+        for chunk in chunks:
+            output_stream.write(convert_lines(chunk, options))
+        return
+
+    with concurrent.futures.ProcessPoolExecutor(max_workers=workers) as executor:
+        pending = collections.deque()
+        for chunk in chunks:
+            pending.append(executor.submit(convert_lines, chunk, options))
+            if len(pending) >= 2 * workers:
+                output_stream.write(pending.popleft().result())
+        while pending:
+            output_stream.write(pending.popleft().result())
+
+
+def print_float32_deviation(options: ConversionOptions):
+    """
+    Print to stderr the maximum deviation of the float32 conversion from the
+    float64 one, over the whole domain of the locus.
+    """
+    colorspace = colour.RGB_COLOURSPACES[options.colorspace]
+    deviation = get_float32_deviation(
+        colorspace,
+        illuminant=get_whitepoint(options.illuminant, colorspace),
+        cat=options.cat,
+        locus=options.locus,
+        normalize=options.normalize,
+    )
+    values = ", ".join(f"{name} {value:.1e}" for name, value in deviation.items())
+    print(f"float32 maximum deviation from float64: {values}", file=sys.stderr)
+
+
+def get_cli(argv: Optional[list[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        prog="temperature2rgb",
+        description=(
+            "Convert Kelvin temperatures to RGB colors. "
+            "Input rows are 'temperature[,tint]', newline-delimited or CSV, "
+            "tint being in the -150..150 range of the app."
+        ),
+    )
+    parser.add_argument(
+        "input",
+        nargs="?",
+        default="-",
+        help="path to the file to convert, '-' (default) to read stdin.",
+    )
+    parser.add_argument(
+        "-o",
+        "--output",
+        default="-",
+        help="path to the file to write, '-' (default) to write to stdout.",
+    )
+    parser.add_argument(
+        "--format",
+        choices=OUTPUT_FORMATS,
+        default="tuple",
+        help="RGB tuple, RGBA Katana, Nuke Constant node or CIE xy tuple.",
+    )
+    parser.add_argument(
+        "--colorspace",
+        default="sRGB",
+        choices=sorted(colour.RGB_COLOURSPACES.keys()),
+        metavar="COLORSPACE",
+        help="target colorspace primaries, any colour-science colourspace name.",
+    )
+    parser.add_argument(
+        "--illuminant",
+        default=None,
+        help="target illuminant (ex: D65), default to the colorspace whitepoint.",
+    )
+    parser.add_argument(
+        "--cat",
+        default="Bradford",
+        choices=sorted(colour.CHROMATIC_ADAPTATION_TRANSFORMS.keys()),
+        help="chromatic adaptation transform for whitepoint conversion.",
+    )
+    parser.add_argument("--locus", default="Planckian", choices=list(LOCI))
+    parser.add_argument(
+        "--no-normalize",
+        dest="normalize",
+        action="store_false",
+        help="don't remap values into the 0.0-1.0 range.",
+    )
+    parser.add_argument(
+        "--decimals",
+        type=int,
+        default=3,
+        choices=range(1, 10),
+        metavar="[1-9]",
+        help="number of decimals.",
+    )
+    parser.add_argument("--backend", default="reference", choices=PLANCKIAN_BACKENDS)
+    parser.add_argument(
+        "--dtype",
+        default="float64",
+        choices=DTYPES,
+        help="float32 converts large inputs faster with less memory, its maximum "
+        "deviation from float64 is printed to stderr.",
+    )
+    parser.add_argument(
+        "--chunk-size",
+        type=int,
+        default=50000,
+        help="number of rows converted at once.",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=os.cpu_count() or 1,
+        help="number of processes converting chunks in parallel.",
+    )
+    parsed = parser.parse_args(argv)
+
+    illuminants = colour.CCS_ILLUMINANTS["CIE 1931 2 Degree Standard Observer"]
+    if parsed.illuminant is not None and parsed.illuminant not in illuminants:
+        parser.error(
+            f"invalid illuminant {parsed.illuminant!r}, "
+            f"expected one of {sorted(illuminants)}"
+        )
+    if parsed.chunk_size < 1:
+        parser.error("--chunk-size must be at least 1")
+
+    return parsed
+
+
+def main(argv: Optional[list[str]] = None):
+    cli = get_cli(argv)
+    options = ConversionOptions(
+        colorspace=cli.colorspace,
+        illuminant=cli.illuminant,
+        cat=cli.cat,
+        locus=cli.locus,
+        normalize=cli.normalize,
+        ndecimals=cli.decimals,
+        output_format=cli.format,
+        backend=cli.backend,
+        dtype=cli.dtype,
+    )
+
+    input_stream = sys.stdin if cli.input == "-" else open(cli.input, encoding="utf-8")
+    output_stream = (
+        sys.stdout if cli.output == "-" else open(cli.output, "w", encoding="utf-8")
+    )
+    try:
+        colour.utilities.filter_warnings(
+            colour_usage_warnings=True, python_warnings=True
+        )
+        if options.dtype == "float32":
+            print_float32_deviation(options)
+        convert_stream(
+            input_stream,
+            output_stream,
+            options=options,
+            chunk_size=cli.chunk_size,
+            workers=cli.workers,
+        )
+    except ValueError as error:
+        sys.exit(f"error: {error}")
+    finally:
+        if input_stream is not sys.stdin:
+            input_stream.close()
+        if output_stream is not sys.stdout:
+            output_stream.close()
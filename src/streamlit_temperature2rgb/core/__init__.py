@@ -1,8 +1,68 @@
 from ._conversions import PlanckianCCTConversion
 from ._conversions import DaylightCCTConversion
+from ._conversions import SpectralCCTConversion
+from ._conversions import BaseCCTConversion
+from ._conversions import CCTBatchResult
+from ._conversions import LOCI
+from ._conversions import convert_cct_batch
+from ._conversions import normalize_rgb
+from ._conversions import get_whitepoint
+from ._conversions import PLANCKIAN_BACKENDS
+from ._conversions import FLOAT32_DOMAINS
+from ._conversions import get_float32_deviation
+from ._lut import PlanckianLUT
+from ._matrices import get_XYZ_to_RGB_matrix
+from ._matrices import get_XYZ_to_RGB_matrices
+from ._comparison import get_XYZ_to_RGB_matrix_stack
+from ._comparison import compare_targets
+from ._diagram import get_chromaticity_diagram_data
+from ._diagram import create_chromaticity_diagram_spec
+from ._lut import get_planckian_lut
+from ._lut import LocusTable
+from ._lut import get_daylight_table
+from ._inverse import InverseCCTResult
+from ._inverse import xy_to_cct_batch
+from ._inverse import rgb_to_cct_batch
+from ._image import get_white_balance_matrix
+from ._image import apply_white_balance
+from ._image import white_balance_npy
+from ._charts import create_kelvin_ramp
+from ._charts import create_cct_tint_chart
+from ._charts import write_png16
+from ._charts import image_to_png16
+from ._charts import image_to_npy
+from ._exporters import iter_nuke_script
+from ._exporters import iter_cube_lut
+from ._exporters import iter_table
 from ._conversions import rgb_array_to_image
+from ._conversions import rgb_array_to_png
 from ._stringify import rgb_array_to_nuke
 from ._stringify import rgb_array_to_tuple
 from ._stringify import rgb_array_to_single_line
 from ._stringify import xy_array_to_tuple
-from ._plot import plot_cct_conversion
+from ._stringify import rgb_batch_to_nuke
+from ._stringify import rgb_batch_to_tuple
+from ._stringify import rgb_batch_to_single_line
+from ._stringify import xy_batch_to_tuple
+from ._stringify import get_nuke_node_name
+from ._stringify import get_nuke_node_label
+
+_PLOT_EXPORTS = (
+    "plot_cct_conversion",
+    "render_cct_conversion",
+    "get_cct_plot_background",
+    "CCTPlotBackground",
+    "create_figure",
+    "render_figure",
+    "release_figure",
+    "get_figure_count",
+)
+
+
+def __getattr__(name):
+    # plotting is only imported when first needed as it is slow to import
+    if name in _PLOT_EXPORTS:
+        from . import _plot
+
+        return getattr(_plot, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,188 @@
+import io
+import struct
+import zlib
+from typing import BinaryIO
+
+import colour
+import numpy
+
+from ._conversions import convert_cct_batch
+
+PNG_ROWS_PER_CHUNK = 256
+"""
+Number of image rows converted and compressed at once when encoding PNGs.
+"""
+
+CHART_PIXELS_PER_CHUNK = 1 << 20
+"""
+Number of pixels of the temperature × tint chart converted at once, which bounds
+the memory of the intermediate arrays to a few times the output chunk.
+"""
+
+
+def create_kelvin_ramp(
+    CCT_min: float,
+    CCT_max: float,
+    width: int,
+    height: int,
+    colorspace: colour.RGB_Colourspace,
+    illuminant: numpy.ndarray,
+    cat: str,
+    tint: float = 0.0,
+    locus: str = "Planckian",
+    normalize: bool = True,
+    backend: str = "reference",
+) -> numpy.ndarray:
+    """
+    Create an image of temperatures increasing linearly from left to right.
+
+    Only one conversion per column is computed, in a single vectorized pass.
+
+    Args:
+        CCT_min: temperature of the first column, in kelvins.
+        CCT_max: temperature of the last column, in kelvins.
+        width: number of columns
+        height: number of rows
+        colorspace: target RGB colorspace
+        illuminant: CIE xy coordinates of the illuminant the rgb values are adapted to
+        cat: name of the chromatic adaptation transform
+        tint: Duv offset, only used by the Planckian locus.
+        locus: one of the ``LOCI`` keys
+        normalize: True to remap each rgb triplet so its maximum is 1.0
+        backend: how the Planckian locus is evaluated
+
+    Returns:
+        read-only linear rgb array of shape (height, width, 3)
+    """
+    result = convert_cct_batch(
+        numpy.linspace(CCT_min, CCT_max, width),
+        colorspace=colorspace,
+        illuminant=illuminant,
+        cat=cat,
+        tint=tint,
+        locus=locus,
+        normalize=normalize,
+        backend=backend,
+    )
+    return numpy.broadcast_to(result.rgb, (height, width, 3))
+
+
+def create_cct_tint_chart(
+    CCT_min: float,
+    CCT_max: float,
+    D_uv_min: float,
+    D_uv_max: float,
+    width: int,
+    height: int,
+    colorspace: colour.RGB_Colourspace,
+    illuminant: numpy.ndarray,
+    cat: str,
+    normalize: bool = True,
+    backend: str = "reference",
+) -> numpy.ndarray:
+    """
+    Create an image of Planckian temperatures increasing from left to right and
+    tints increasing from bottom to top, converted by chunks of rows of
+    ``CHART_PIXELS_PER_CHUNK`` pixels.
+
+    Args:
+        CCT_min: temperature of the first column, in kelvins.
+        CCT_max: temperature of the last column, in kelvins.
+        D_uv_min: tint of the last row.
+        D_uv_max: tint of the first row.
+        width: number of columns
+        height: number of rows
+        colorspace: target RGB colorspace
+        illuminant: CIE xy coordinates of the illuminant the rgb values are adapted to
+        cat: name of the chromatic adaptation transform
+        normalize: True to remap each rgb triplet so its maximum is 1.0
+        backend: how the Planckian locus is evaluated
+
+    Returns:
+        linear rgb array of shape (height, width, 3)
+    """
+    CCT = numpy.linspace(CCT_min, CCT_max, width)
+    D_uv = numpy.linspace(D_uv_max, D_uv_min, height)
+    image = numpy.empty((height, width, 3), dtype=numpy.float64)
+    rows_per_chunk = max(1, CHART_PIXELS_PER_CHUNK // width)
+    for start in range(0, height, rows_per_chunk):
+        rows = D_uv[start : start + rows_per_chunk]
+        result = convert_cct_batch(
+            numpy.tile(CCT, len(rows)),
+            colorspace=colorspace,
+            illuminant=illuminant,
+            cat=cat,
+            tint=numpy.repeat(rows, width),
+            locus="Planckian",
+            normalize=normalize,
+            backend=backend,
+        )
+        image[start : start + len(rows)] = result.rgb.reshape(len(rows), width, 3)
+    return image
+
+
+def _png_chunk(chunk_type: bytes, data: bytes) -> bytes:
+    chunk = chunk_type + data
+    return struct.pack(">I", len(data)) + chunk + struct.pack(">I", zlib.crc32(chunk))
+
+
+def write_png16(image: numpy.ndarray, stream: BinaryIO):
+    """
+    Write a linear rgb image as a 16-bit PNG, encoded with the same 2.2 power
+    function as the preview.
+
+    Rows are converted and compressed by chunks so only the compressed file is
+    held in memory.
+
+    Args:
+        image:
+            linear rgb array of shape (height, width, 3), clipped to 0-1. A fourth
+            channel is written as a linear alpha.
+        stream: binary file-like object to write to.
+    """
+    height, width, channels = image.shape
+    row_size = width * channels * 2
+    stream.write(b"\x89PNG\r\n\x1a\n")
+    # 16 bits per channel, truecolor (with alpha), default compression/filter/interlace
+    color_type = 6 if channels == 4 else 2
+    header = struct.pack(">IIBBBBB", width, height, 16, color_type, 0, 0, 0)
+    stream.write(_png_chunk(b"IHDR", header))
+
+    compressor = zlib.compressobj(level=6)
+    previous_row = numpy.zeros(row_size, dtype=numpy.uint8)
+    for start in range(0, height, PNG_ROWS_PER_CHUNK):
+        rows = numpy.clip(image[start : start + PNG_ROWS_PER_CHUNK], 0.0, 1.0)
+        rows[..., :3] **= 1 / 2.2
+        rows = (rows * 65535 + 0.5).astype(">u2")
+        rows = rows.reshape(len(rows), -1).view(numpy.uint8)
+        # each row is prefixed by its filter type, 2 is "up": the difference with
+        # the previous row, very compressible for ramps and smooth charts.
+        scanlines = numpy.full((len(rows), 1 + row_size), 2, dtype=numpy.uint8)
+        numpy.subtract(rows[:1], previous_row, out=scanlines[:1, 1:])
+        numpy.subtract(rows[1:], rows[:-1], out=scanlines[1:, 1:])
+        previous_row = rows[-1]
+        data = compressor.compress(scanlines.tobytes())
+        if data:
+            stream.write(_png_chunk(b"IDAT", data))
+
+    stream.write(_png_chunk(b"IDAT", compressor.flush()))
+    stream.write(_png_chunk(b"IEND", b""))
+
+
+def image_to_png16(image: numpy.ndarray) -> bytes:
+    """
+    Same as ``write_png16`` but return the file content.
+    """
+    buffer = io.BytesIO()
+    write_png16(image, buffer)
+    return buffer.getvalue()
+
+
+def image_to_npy(image: numpy.ndarray) -> bytes:
+    """
+    Returns:
+        content of a ``.npy`` file of the linear float values.
+    """
+    buffer = io.BytesIO()
+    numpy.save(buffer, numpy.ascontiguousarray(image), allow_pickle=False)
+    return buffer.getvalue()
@@ -0,0 +1,66 @@
+from typing import Optional
+from typing import Sequence
+
+import colour
+import numpy
+
+from ._conversions import get_whitepoint
+from ._conversions import normalize_rgb
+from ._matrices import get_XYZ_to_RGB_matrix
+
+
+def get_XYZ_to_RGB_matrix_stack(
+    colorspaces: Sequence[colour.RGB_Colourspace],
+    illuminants: Sequence[Optional[str]],
+    cats: Sequence[str],
+) -> numpy.ndarray:
+    """
+    Get the matrices of every combination of the targets, see
+    ``get_XYZ_to_RGB_matrix``.
+
+    Args:
+        colorspaces: target RGB colorspaces
+        illuminants: names of the illuminants the rgb values are adapted to, None
+            for the colorspace whitepoint.
+        cats: names of the chromatic adaptation transforms
+
+    Returns:
+        array of shape (colorspaces, illuminants, cats, 3, 3)
+    """
+    matrices = numpy.empty((len(colorspaces), len(illuminants), len(cats), 3, 3))
+    for index_colorspace, colorspace in enumerate(colorspaces):
+        for index_illuminant, illuminant in enumerate(illuminants):
+            whitepoint = get_whitepoint(illuminant, colorspace)
+            for index_cat, cat in enumerate(cats):
+                matrices[index_colorspace, index_illuminant, index_cat] = (
+                    get_XYZ_to_RGB_matrix(colorspace, whitepoint, cat)
+                )
+    return matrices
+
+
+def compare_targets(
+    XYZ: numpy.ndarray,
+    colorspaces: Sequence[colour.RGB_Colourspace],
+    illuminants: Sequence[Optional[str]],
+    cats: Sequence[str],
+    normalize: bool = False,
+) -> numpy.ndarray:
+    """
+    Convert CIE XYZ values to every combination of colorspace, illuminant and
+    chromatic adaptation transform, with a single stacked matrix product.
+
+    Args:
+        XYZ: CIE XYZ tristimulus values of shape (..., 3), usually the ``XYZ``
+            of a single conversion.
+        colorspaces: target RGB colorspaces
+        illuminants: names of the illuminants the rgb values are adapted to, None
+            for the colorspace whitepoint.
+        cats: names of the chromatic adaptation transforms
+        normalize: True to remap each rgb triplet so its maximum is 1.0
+
+    Returns:
+        rgb values of shape (colorspaces, illuminants, cats, ..., 3)
+    """
+    matrices = get_XYZ_to_RGB_matrix_stack(colorspaces, illuminants, cats)
+    rgb = numpy.einsum("abcij,...j->abc...i", matrices, XYZ)
+    return normalize_rgb(rgb) if normalize else rgb
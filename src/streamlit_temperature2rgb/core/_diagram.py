@@ -0,0 +1,148 @@
+import copy
+import functools
+
+import colour
+import numpy
+
+DIAGRAM_WAVELENGTHS = numpy.arange(380, 701, 5)
+"""
+Wavelengths, in nanometers, of the spectral locus points sent to the browser.
+"""
+
+DIAGRAM_TEMPERATURES = numpy.geomspace(1000, 20000, 48)
+"""
+Temperatures, in kelvins, of the Planckian locus points sent to the browser.
+"""
+
+
+def xy_to_uv(xy: numpy.ndarray) -> numpy.ndarray:
+    """
+    Convert CIE xy chromaticity coordinates to CIE 1960 UCS uv.
+    """
+    x, y = numpy.moveaxis(numpy.asarray(xy, dtype=numpy.float64), -1, 0)
+    denominator = -2 * x + 12 * y + 3
+    return numpy.stack([4 * x / denominator, 6 * y / denominator], axis=-1)
+
+
+def _to_rows(uv: numpy.ndarray, series: str, labels) -> list[dict]:
+    return [
+        {"u": u, "v": v, "series": series, "order": order, "label": label}
+        for order, ((u, v), label) in enumerate(zip(uv.tolist(), labels))
+    ]
+
+
+@functools.lru_cache(maxsize=16)
+def get_chromaticity_diagram_data(colorspace_name: str) -> tuple[dict, ...]:
+    """
+    Get the lines of the CIE 1960 UCS chromaticity diagram, computed once per
+    process: the spectral locus, the Planckian locus and the colorspace gamut.
+
+    Returns:
+        rows with the ``u``, ``v``, ``series``, ``order`` and ``label`` fields.
+    """
+    cmfs = colour.MSDS_CMFS["CIE 1931 2 Degree Standard Observer"]
+    XYZ = cmfs[DIAGRAM_WAVELENGTHS]
+    spectral_uv = xy_to_uv(colour.XYZ_to_xy(XYZ))
+    # closed by the line of purples
+    spectral_uv = numpy.concatenate([spectral_uv, spectral_uv[:1]])
+    wavelengths = [f"{wavelength}nm" for wavelength in DIAGRAM_WAVELENGTHS.tolist()]
+
+    planckian_uv = colour.temperature.CCT_to_uv(
+        numpy.stack([DIAGRAM_TEMPERATURES, numpy.zeros(len(DIAGRAM_TEMPERATURES))], -1),
+        method="Ohno 2013",
+    )
+    temperatures = [f"{CCT:.0f}K" for CCT in DIAGRAM_TEMPERATURES.tolist()]
+
+    colorspace = colour.RGB_COLOURSPACES[colorspace_name]
+    gamut_uv = xy_to_uv(
+        numpy.concatenate([colorspace.primaries, colorspace.primaries[:1]])
+    )
+
+    rows = (
+        _to_rows(spectral_uv, "Spectral locus", wavelengths + [wavelengths[0]])
+        + _to_rows(planckian_uv, "Planckian locus", temperatures)
+        + _to_rows(gamut_uv, f"{colorspace_name} gamut", ["R", "G", "B", "R"])
+    )
+    return tuple(rows)
+
+
+@functools.lru_cache(maxsize=16)
+def _get_chromaticity_diagram_spec(colorspace_name: str) -> dict:
+    position = {
+        "x": {
+            "field": "u",
+            "type": "quantitative",
+            "scale": {"domain": [0.0, 0.5]},
+        },
+        "y": {
+            "field": "v",
+            "type": "quantitative",
+            "scale": {"domain": [0.0, 0.45]},
+        },
+    }
+    return {
+        "height": 600,
+        "datasets": {"diagram": list(get_chromaticity_diagram_data(colorspace_name))},
+        "layer": [
+            {
+                "data": {"name": "diagram"},
+                "mark": {"type": "line", "strokeWidth": 1.5, "clip": True},
+                "encoding": {
+                    **position,
+                    "color": {"field": "series", "type": "nominal", "title": None},
+                    "order": {"field": "order", "type": "quantitative"},
+                    "tooltip": [{"field": "label", "title": "point"}],
+                },
+                "params": [{"name": "view", "select": "interval", "bind": "scales"}],
+            },
+            {
+                "data": {"name": "marker"},
+                "mark": {
+                    "type": "point",
+                    "shape": "cross",
+                    "size": 150,
+                    "filled": True,
+                    "color": "white",
+                    "clip": True,
+                },
+                "encoding": {
+                    **position,
+                    "tooltip": [
+                        {"field": "CCT", "title": "temperature"},
+                        {"field": "x", "format": ".4f"},
+                        {"field": "y", "format": ".4f"},
+                    ],
+                },
+            },
+        ],
+    }
+
+
+def create_chromaticity_diagram_spec(
+    colorspace_name: str,
+    xy: numpy.ndarray,
+    CCT: float,
+) -> dict:
+    """
+    Get a Vega-Lite spec of the CIE 1960 UCS chromaticity diagram with a marker,
+    rendered by the browser with zoom and pan.
+
+    The diagram lines are computed once per process and are the same object for
+    every call, only the small ``marker`` dataset changes.
+
+    Args:
+        colorspace_name: name of the colorspace whose gamut is drawn.
+        xy: CIE xy chromaticity coordinates of the marker
+        CCT: temperature shown in the marker tooltip, in kelvins.
+
+    Returns:
+        a new spec dict sharing the diagram data, to not modify.
+    """
+    spec = copy.copy(_get_chromaticity_diagram_spec(colorspace_name))
+    x, y = numpy.asarray(xy, dtype=numpy.float64).reshape(2).tolist()
+    u, v = xy_to_uv([x, y]).tolist()
+    spec["datasets"] = {
+        **spec["datasets"],
+        "marker": [{"u": u, "v": v, "x": x, "y": y, "CCT": f"{CCT}K"}],
+    }
+    return spec
@@ -0,0 +1,158 @@
+from typing import Iterator
+from typing import Optional
+
+import numpy
+
+from ._stringify import _format_batch
+from ._stringify import get_nuke_node_label
+from ._stringify import get_nuke_node_name
+from ._stringify import rgb_batch_to_nuke
+
+EXPORT_CHUNK_SIZE = 16384
+"""
+Number of rows formatted at once by the exporters.
+"""
+
+NUKE_NODE_SPACING = (110, 80)
+"""
+Horizontal and vertical distance between the Nuke nodes, in Nuke units.
+"""
+
+
+def iter_nuke_script(
+    CCT: numpy.ndarray,
+    rgb: numpy.ndarray,
+    colorspace_name: str,
+    use_daylight: bool,
+    ndecimals: int,
+    tint: Optional[numpy.ndarray] = None,
+    columns: int = 10,
+) -> Iterator[str]:
+    """
+    Generate a Nuke script with a Constant node per temperature, laid out in a
+    grid and named like the app does.
+
+    The script can be opened with ``File > Insert Comp Nodes`` or pasted in the
+    node graph.
+
+    Args:
+        CCT: (N,) temperatures, in kelvins.
+        rgb: (N, 3) rgb values of each temperature
+        colorspace_name: name of the rgb colorspace, used in the node names.
+        use_daylight: True if the temperatures are on the daylight locus.
+        ndecimals: number of decimals of the rgb values
+        tint: (N,) tint of each temperature in the app units, default to 0.0.
+        columns: number of nodes per row of the grid
+
+    Returns:
+        generator of parts of the file content, to write in order.
+    """
+    tint = (
+        numpy.zeros(len(CCT)) if tint is None else numpy.broadcast_to(tint, CCT.shape)
+    )
+    yield "set cut_paste_input [stack 0]"
+
+    for start in range(0, len(CCT), EXPORT_CHUNK_SIZE):
+        stop = start + EXPORT_CHUNK_SIZE
+        temperatures = CCT[start:stop].tolist()
+        rows, grid_columns = numpy.divmod(
+            numpy.arange(start, start + len(temperatures)), columns
+        )
+        positions = numpy.stack(
+            [grid_columns * NUKE_NODE_SPACING[0], rows * NUKE_NODE_SPACING[1]],
+            axis=-1,
+        )
+        yield "\n" + rgb_batch_to_nuke(
+            rgb[start:stop],
+            ndecimals,
+            node_names=[
+                get_nuke_node_name(temperature, colorspace_name, use_daylight)
+                for temperature in temperatures
+            ],
+            node_labels=[
+                get_nuke_node_label(temperature, colorspace_name, use_daylight, value)
+                for temperature, value in zip(temperatures, tint[start:stop].tolist())
+            ],
+            positions=positions,
+        )
+    yield "\n"
+
+
+def iter_cube_lut(
+    rgb: numpy.ndarray,
+    CCT_min: float,
+    CCT_max: float,
+    title: str = "Temperature2RGB",
+    ndecimals: int = 6,
+) -> Iterator[str]:
+    """
+    Generate a 1D ``.cube`` LUT mapping a normalized temperature to rgb, 0.0 being
+    ``CCT_min`` and 1.0 ``CCT_max``.
+
+    Args:
+        rgb: (N, 3) rgb values of the N temperatures evenly spaced from ``CCT_min``
+            to ``CCT_max``.
+        CCT_min: temperature of the first entry, in kelvins.
+        CCT_max: temperature of the last entry, in kelvins.
+        title: name stored in the LUT
+        ndecimals: number of decimals of the rgb values
+
+    Returns:
+        generator of parts of the file content, to write in order.
+    """
+    yield (
+        f'TITLE "{title}"\n'
+        f"# input 0.0 is {CCT_min}K and 1.0 is {CCT_max}K\n"
+        f"LUT_1D_SIZE {len(rgb)}\n"
+        f"DOMAIN_MIN 0.0 0.0 0.0\n"
+        f"DOMAIN_MAX 1.0 1.0 1.0\n"
+    )
+    for start in range(0, len(rgb), EXPORT_CHUNK_SIZE):
+        chunk = rgb[start : start + EXPORT_CHUNK_SIZE]
+        yield "".join(
+            f"{r:.{ndecimals}f} {g:.{ndecimals}f} {b:.{ndecimals}f}\n"
+            for r, g, b in chunk.tolist()
+        )
+
+
+def iter_table(
+    CCT: numpy.ndarray,
+    rgb: numpy.ndarray,
+    xy: numpy.ndarray,
+    ndecimals: int,
+    tint: Optional[numpy.ndarray] = None,
+    delimiter: str = ",",
+) -> Iterator[str]:
+    """
+    Generate a CSV (or TSV with a tab delimiter) table of the temperatures with
+    their rgb and CIE xy values, rounded like the app does.
+
+    Args:
+        CCT: (N,) temperatures, in kelvins.
+        rgb: (N, 3) rgb values of each temperature
+        xy: (N, 2) CIE xy chromaticity coordinates of each temperature
+        ndecimals: number of decimals of the rgb and xy values
+        tint: (N,) tint of each temperature in the app units, default to 0.0.
+        delimiter: column separator
+
+    Returns:
+        generator of parts of the file content, to write in order.
+    """
+    tint = (
+        numpy.zeros(len(CCT)) if tint is None else numpy.broadcast_to(tint, CCT.shape)
+    )
+    columns = ("temperature", "tint", "r", "g", "b", "x", "y")
+    yield delimiter.join(columns) + "\n"
+
+    for start in range(0, len(CCT), EXPORT_CHUNK_SIZE):
+        stop = start + EXPORT_CHUNK_SIZE
+        colors = numpy.concatenate([rgb[start:stop], xy[start:stop]], axis=-1)
+        rows = zip(
+            CCT[start:stop].tolist(),
+            tint[start:stop].tolist(),
+            _format_batch(colors, ndecimals, "", delimiter, "").split("\n"),
+        )
+        yield "".join(
+            f"{temperature}{delimiter}{value}{delimiter}{color}\n"
+            for temperature, value, color in rows
+        )
@@ -0,0 +1,161 @@
+import concurrent.futures
+import math
+import os
+from pathlib import Path
+from typing import Optional
+
+import colour
+import numpy
+
+from ._conversions import BaseCCTConversion
+
+DEFAULT_TILE_PIXELS = 1 << 20
+"""
+Number of pixels processed at once by a worker, about 12MB of float32 rgb.
+"""
+
+
+def get_white_balance_matrix(
+    conversion: BaseCCTConversion,
+    invert: bool = False,
+) -> numpy.ndarray:
+    """
+    Get the 3x3 matrix white balancing rgb values of the conversion colorspace,
+    using the conversion chromatic adaptation transform.
+
+    Values lit by the conversion temperature are adapted so the light color becomes
+    neutral, that is ``conversion.rgb`` becomes achromatic with the same luminance.
+
+    Args:
+        conversion: a single temperature conversion
+        invert: True to get the opposite transform, giving neutral values the
+            color of the conversion temperature.
+
+    Returns:
+        3x3 matrix to apply on column vectors.
+    """
+    colorspace = conversion.colorspace
+    source = numpy.matmul(colorspace.matrix_RGB_to_XYZ, conversion.rgb)
+    target = colour.xyY_to_XYZ(colour.xy_to_xyY(colorspace.whitepoint))
+    matrix_cat = colour.adaptation.matrix_chromatic_adaptation_VonKries(
+        source / source[1],
+        target / target[1],
+        transform=conversion.cat,
+    )
+    matrix = colorspace.matrix_XYZ_to_RGB @ matrix_cat @ colorspace.matrix_RGB_to_XYZ
+    if invert:
+        matrix = numpy.linalg.inv(matrix)
+    return matrix
+
+
+def _apply_tile(
+    image: numpy.ndarray,
+    out: numpy.ndarray,
+    matrix: numpy.ndarray,
+    start: int,
+    stop: int,
+):
+    tile = image[start:stop]
+    # contiguous copy of the rgb channels so the product goes through BLAS
+    pixels = numpy.empty(tile.shape[:-1] + (3,), dtype=matrix.dtype)
+    pixels[...] = tile[..., :3]
+    result = numpy.matmul(pixels.reshape(-1, 3), matrix.T)
+    out[start:stop, ..., :3] = result.reshape(pixels.shape)
+    if tile.shape[-1] > 3 and out is not image:
+        out[start:stop, ..., 3:] = tile[..., 3:]
+
+
+def apply_white_balance(
+    image: numpy.ndarray,
+    matrix: numpy.ndarray,
+    out: Optional[numpy.ndarray] = None,
+    tile_pixels: int = DEFAULT_TILE_PIXELS,
+    workers: Optional[int] = None,
+) -> numpy.ndarray:
+    """
+    Apply a 3x3 matrix on the rgb channels of an image, tile by tile.
+
+    Only one tile per worker is held in memory on top of the input and output
+    arrays, so both can be memory-mapped arrays larger than the available memory.
+
+    Args:
+        image: array of shape (..., C) with C >= 3, extra channels like alpha are
+            copied unchanged. Usually (height, width, C).
+        matrix: 3x3 matrix to apply on column vectors, like
+            ``get_white_balance_matrix`` returns.
+        out: array of the same shape to write to, can be ``image`` itself to
+            process it in place. Default to a new array.
+        tile_pixels: approximate number of pixels of a tile, tiles are slices of
+            the first axis.
+        workers: number of threads processing tiles, default to the cpu count.
+
+    Returns:
+        the ``out`` array.
+    """
+    if image.ndim < 2 or image.shape[-1] < 3:
+        raise ValueError(f"Expected an array of shape (..., C>=3), got {image.shape}")
+    if out is None:
+        out = numpy.empty_like(image)
+    elif out.shape != image.shape:
+        raise ValueError(f"Output shape {out.shape} doesn't match {image.shape}")
+
+    # float16 and float32 images are processed in float32, the rest in float64
+    dtype = numpy.float64
+    if numpy.issubdtype(image.dtype, numpy.floating) and image.dtype.itemsize <= 4:
+        dtype = numpy.float32
+    matrix = numpy.asarray(matrix, dtype=dtype)
+
+    row_pixels = math.prod(image.shape[1:-1])
+    rows = max(1, tile_pixels // max(1, row_pixels))
+    bounds = [
+        (start, min(start + rows, image.shape[0]))
+        for start in range(0, image.shape[0], rows)
+    ]
+    workers = workers or os.cpu_count() or 1
+
+    if workers == 1 or len(bounds) == 1:
+        for start, stop in bounds:
+            _apply_tile(image, out, matrix, start, stop)
+        return out
+
+    with concurrent.futures.ThreadPoolExecutor(max_workers=workers) as executor:
+        futures = [
+            executor.submit(_apply_tile, image, out, matrix, start, stop)
+            for start, stop in bounds
+        ]
+        for future in futures:
+            future.result()
+    return out
+
+
+def white_balance_npy(
+    input_path: Path,
+    output_path: Optional[Path],
+    matrix: numpy.ndarray,
+    tile_pixels: int = DEFAULT_TILE_PIXELS,
+    workers: Optional[int] = None,
+) -> numpy.memmap:
+    """
+    Apply ``apply_white_balance`` on a ``.npy`` file, memory-mapping both files.
+
+    Args:
+        input_path: ``.npy`` file of shape (..., C>=3)
+        output_path: ``.npy`` file to create, None to modify the input in place.
+        matrix: 3x3 matrix to apply on column vectors
+        tile_pixels: see ``apply_white_balance``
+        workers: see ``apply_white_balance``
+
+    Returns:
+        the memory-mapped output.
+    """
+    if output_path is None:
+        image = numpy.load(input_path, mmap_mode="r+")
+        out = image
+    else:
+        image = numpy.load(input_path, mmap_mode="r")
+        out = numpy.lib.format.open_memmap(
+            output_path, mode="w+", dtype=image.dtype, shape=image.shape
+        )
+    apply_white_balance(image, matrix, out, tile_pixels=tile_pixels, workers=workers)
+    out.flush()
+    return out
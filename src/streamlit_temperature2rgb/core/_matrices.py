@@ -0,0 +1,78 @@
+import threading
+from typing import Optional
+
+import colour
+import numpy
+
+MatrixKey = tuple[str, tuple[float, float], Optional[str]]
+
+_REGISTRY: dict[MatrixKey, numpy.ndarray] = {}
+_REGISTRY_LOCK = threading.Lock()
+
+
+def _get_matrix_key(
+    colorspace: colour.RGB_Colourspace,
+    illuminant: numpy.ndarray,
+    cat: Optional[str],
+) -> MatrixKey:
+    x, y = numpy.asarray(illuminant, dtype=numpy.float64).reshape(2)
+    return colorspace.name, (float(x), float(y)), cat
+
+
+def _compute_XYZ_to_RGB_matrix(
+    colorspace: colour.RGB_Colourspace,
+    illuminant: numpy.ndarray,
+    cat: Optional[str],
+) -> numpy.ndarray:
+    # same operations than colour.XYZ_to_RGB, but composed in a single matrix;
+    # copied as the registry freezes it and it is the colorspace own attribute
+    matrix = colorspace.matrix_XYZ_to_RGB.copy()
+    if cat is not None:
+        matrix_cat = colour.adaptation.matrix_chromatic_adaptation_VonKries(
+            colour.xyY_to_XYZ(colour.xy_to_xyY(illuminant)),
+            colour.xyY_to_XYZ(colour.xy_to_xyY(colorspace.whitepoint)),
+            transform=cat,
+        )
+        matrix = numpy.matmul(matrix, matrix_cat)
+    return matrix
+
+
+def get_XYZ_to_RGB_matrix(
+    colorspace: colour.RGB_Colourspace,
+    illuminant: numpy.ndarray,
+    cat: Optional[str],
+) -> numpy.ndarray:
+    """
+    Get the 3x3 matrix adapting CIE XYZ values from the given illuminant to the
+    colorspace whitepoint, then converting them to the colorspace rgb.
+
+    Matrices are computed once per process and then shared.
+
+    Args:
+        colorspace: target RGB colorspace
+        illuminant: CIE xy coordinates of the illuminant the XYZ values are under
+        cat: name of the chromatic adaptation transform, None to not adapt.
+
+    Returns:
+        read-only 3x3 matrix to apply on column vectors.
+    """
+    key = _get_matrix_key(colorspace, illuminant, cat)
+    matrix = _REGISTRY.get(key)
+    if matrix is not None:
+        return matrix
+
+    matrix = _compute_XYZ_to_RGB_matrix(colorspace, illuminant, cat)
+    matrix.setflags(write=False)
+    with _REGISTRY_LOCK:
+        return _REGISTRY.setdefault(key, matrix)
+
+
+def get_XYZ_to_RGB_matrices() -> dict[MatrixKey, numpy.ndarray]:
+    """
+    Get all the matrices computed so far, for inspection.
+
+    Returns:
+        mapping of ``(colorspace name, illuminant xy, cat)`` to read-only matrices.
+    """
+    with _REGISTRY_LOCK:
+        return dict(_REGISTRY)
@@ -1,12 +1,83 @@
 import contextlib
+import functools
+import threading
+import weakref
 
 import colour
+import colour.plotting
+import matplotlib.axes
+import matplotlib.backends.backend_agg
+import matplotlib.figure
 import matplotlib.style
 import matplotlib.pyplot
 import numpy
 
 from ._conversions import BaseCCTConversion
 
+_STYLE_LOCK = threading.RLock()
+"""
+Serialize the code using the global matplotlib state: the rcParams changed by the
+style and the current pyplot figure ``colour.plotting`` queries.
+"""
+
+_FIGURES: "weakref.WeakSet[matplotlib.figure.Figure]" = weakref.WeakSet()
+
+
+def get_figure_count() -> dict[str, int]:
+    """
+    Returns:
+        number of figures created by this module still in memory, and of figures
+        registered in pyplot.
+    """
+    return {
+        "figures": len(_FIGURES),
+        "pyplot_figures": len(matplotlib.pyplot.get_fignums()),
+    }
+
+
+def create_figure() -> tuple[matplotlib.figure.Figure, matplotlib.axes.Axes]:
+    """
+    Create a figure with its own Agg canvas, unknown to pyplot, so it can be
+    rendered from any thread and is freed as soon as it is not referenced.
+
+    Call it within ``set_matplotlib_dark_style`` to have the figure styled.
+    """
+    width = matplotlib.rcParams["figure.figsize"][0]
+    figure = matplotlib.figure.Figure(figsize=(width, width))
+    matplotlib.backends.backend_agg.FigureCanvasAgg(figure)
+    _FIGURES.add(figure)
+    return figure, figure.add_subplot()
+
+
+def render_figure(figure: matplotlib.figure.Figure) -> numpy.ndarray:
+    """
+    Returns:
+        RGBA 8bit image of the figure drawn on its Agg canvas.
+    """
+    figure.canvas.draw()
+    return numpy.array(figure.canvas.buffer_rgba())
+
+
+def release_figure(figure: matplotlib.figure.Figure):
+    """
+    Remove all the artists of the figure so their memory is released now rather
+    than by the next garbage collection.
+    """
+    figure.clear()
+    _FIGURES.discard(figure)
+
+
+@contextlib.contextmanager
+def _close_pyplot_figures():
+    # colour.plotting queries the current pyplot figure even when given one, which
+    # creates a figure pyplot would keep forever.
+    before = set(matplotlib.pyplot.get_fignums())
+    try:
+        yield
+    finally:
+        for number in set(matplotlib.pyplot.get_fignums()) - before:
+            matplotlib.pyplot.close(number)
+
 
 @contextlib.contextmanager
 def set_matplotlib_dark_style():
@@ -53,42 +124,40 @@ def set_matplotlib_dark_style():
     style = STYLE_MATPLOTLIB_BASICS.copy()
     style.update(**STYLE_MATPLOTLIB_JERK_MODE)
 
-    try:
-        with matplotlib.style.context(style):
-            yield
-    finally:
-        pass
+    with _STYLE_LOCK, matplotlib.style.context(style), _close_pyplot_figures():
+        yield
 
 
 @set_matplotlib_dark_style()
 def plot_cct_conversion(cct_conversion: BaseCCTConversion):
     """
+    The figure is not managed by pyplot: render it with ``render_figure`` or
+    its canvas, and optionally free it sooner with ``release_figure``.
+
     References:
         - [1] https://colab.research.google.com/drive/1NRcdXSCshivkwoU2nieCvC3y14fx1X4X#scrollTo=Eh7rtFH5Gm-T
     """
-    figure: matplotlib.pyplot.Figure
-    axes: matplotlib.pyplot.Axes
     array = numpy.full((2, 2, 3), cct_conversion.rgb)
     zoom = 0.6
     offset = (0.1, 0.1)
-    (
-        figure,
-        axes,
-    ) = colour.plotting.plot_RGB_chromaticities_in_chromaticity_diagram_CIE1960UCS(
+    figure, axes = create_figure()
+    colour.plotting.plot_RGB_chromaticities_in_chromaticity_diagram_CIE1960UCS(
         array,
         colourspace=cct_conversion.colorspace,
         colourspaces=[cct_conversion.colorspace],
         scatter_kwargs={
             "s": 90,  # size
-            "c": [1, 1, 1],  # color
+            "c": [[1, 1, 1]],  # color
             "marker": "+",
             "zorder": 0,
         },
+        figure=figure,
+        axes=axes,
         # styling
         spectral_locus_colours="RGB",
         show_diagram_colours=False,
         transparent_background=False,
-        standalone=False,
+        show=False,
         # initial bb = (-0.1, 0.7, -0.2, 0.6)
         bounding_box=(
             -0.1 * zoom + offset[0],
@@ -98,7 +167,110 @@ def plot_cct_conversion(cct_conversion: BaseCCTConversion):
         ),
     )
     colour.plotting.temperature.plot_planckian_locus(
-        "#5A534C", axes=axes, method="CIE 1960 UCS"
+        "#5A534C", figure=figure, axes=axes, method="CIE 1960 UCS"
     )
 
     return figure, axes
+
+
+class CCTPlotBackground:
+    """
+    A CIE 1960 UCS chromaticity diagram rendered once, on which the conversion
+    marker is composited for each render (matplotlib blitting).
+
+    Args:
+        colorspace: colorspace whose gamut is drawn
+        zoom: scale of the diagram bounding box, lower values zoom in.
+        offset: translation of the diagram bounding box, in uv units.
+    """
+
+    def __init__(
+        self,
+        colorspace: colour.RGB_Colourspace,
+        zoom: float = 0.6,
+        offset: tuple[float, float] = (0.1, 0.1),
+    ):
+        self.colorspace = colorspace
+        self._lock = threading.Lock()
+
+        with set_matplotlib_dark_style():
+            self._figure, axes = create_figure()
+            self._canvas = self._figure.canvas
+            colour.plotting.plot_RGB_colourspaces_in_chromaticity_diagram_CIE1960UCS(
+                colourspaces=[colorspace],
+                figure=self._figure,
+                axes=axes,
+                # styling
+                spectral_locus_colours="RGB",
+                show_diagram_colours=False,
+                transparent_background=False,
+                show=False,
+                # initial bb = (-0.1, 0.7, -0.2, 0.6)
+                bounding_box=(
+                    -0.1 * zoom + offset[0],
+                    0.7 * zoom + offset[0],
+                    -0.2 * zoom + offset[1],
+                    0.6 * zoom + offset[1],
+                ),
+            )
+            colour.plotting.temperature.plot_planckian_locus(
+                "#5A534C", figure=self._figure, axes=axes, method="CIE 1960 UCS"
+            )
+            # animated artists are skipped by canvas.draw()
+            self._marker = axes.scatter(
+                [],
+                [],
+                s=90,
+                c=[[1, 1, 1]],
+                marker="+",
+                animated=True,
+            )
+            self._canvas.draw()
+            self._background = self._canvas.copy_from_bbox(self._figure.bbox)
+        self._axes = axes
+
+    def render(self, uv: numpy.ndarray) -> numpy.ndarray:
+        """
+        Args:
+            uv: CIE UCS uv coordinates of the marker(s), shape (2,) or (N, 2).
+
+        Returns:
+            RGBA 8bit image of the diagram with the marker.
+        """
+        with self._lock:
+            self._canvas.restore_region(self._background)
+            self._marker.set_offsets(numpy.reshape(uv, (-1, 2)))
+            self._axes.draw_artist(self._marker)
+            return numpy.array(self._canvas.buffer_rgba())
+
+
+@functools.lru_cache(maxsize=16)
+def get_cct_plot_background(
+    colorspace_name: str,
+    zoom: float = 0.6,
+    offset: tuple[float, float] = (0.1, 0.1),
+) -> CCTPlotBackground:
+    """
+    Return the background diagram for the given parameters, created once per process.
+    """
+    colorspace = colour.RGB_COLOURSPACES[colorspace_name]
+    return CCTPlotBackground(colorspace=colorspace, zoom=zoom, offset=offset)
+
+
+def render_cct_conversion(
+    cct_conversion: BaseCCTConversion,
+    zoom: float = 0.6,
+    offset: tuple[float, float] = (0.1, 0.1),
+) -> numpy.ndarray:
+    """
+    Same diagram as ``plot_cct_conversion`` but only the marker is drawn per call.
+
+    Returns:
+        RGBA 8bit image of the diagram.
+    """
+    colorspace = cct_conversion.colorspace
+    background = get_cct_plot_background(colorspace.name, zoom, offset)
+    # same marker position as plot_cct_conversion
+    XYZ = colour.RGB_to_XYZ(cct_conversion.rgb, colorspace)
+    uv = colour.xy_to_UCS_uv(colour.XYZ_to_xy(XYZ))
+    return background.render(uv)
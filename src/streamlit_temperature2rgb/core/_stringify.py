@@ -1,5 +1,15 @@
+from typing import Optional
+from typing import Sequence
+
 import numpy
 
+FORMAT_CHUNK_SIZE = 65536
+"""
+Number of rows formatted at once by the batch functions, bounding the memory of
+their intermediate arrays, float32 inputs being only converted to double
+precision chunk by chunk.
+"""
+
 
 def rgb_array_to_single_line(array: numpy.ndarray, ndecimals: int) -> str:
     r = round(float(array[0]), ndecimals)
@@ -20,6 +30,8 @@ def rgb_array_to_nuke(
     ndecimals: int,
     node_name: str,
     node_label: str,
+    xpos: int = 0,
+    ypos: int = 0,
 ) -> str:
     r = round(float(array[0]), ndecimals)
     g = round(float(array[1]), ndecimals)
@@ -33,8 +45,8 @@ Constant {{
  name {node_name}
  label "{repr(node_label)[1:][:-1]}"
  selected true
- xpos 0
- ypos 0
+ xpos {xpos}
+ ypos {ypos}
 }}"""
 
 
@@ -42,3 +54,263 @@ def xy_array_to_tuple(array: numpy.ndarray, ndecimals: int) -> str:
     x = round(float(array[0]), ndecimals)
     y = round(float(array[1]), ndecimals)
     return f"({x}, {y})"
+
+
+def _round_batch(array: numpy.ndarray, ndecimals: int) -> numpy.ndarray:
+    """
+    Same as calling Python's ``round`` on each value of the array, so the values
+    are formatted like the single colour functions do.
+    """
+    array = numpy.asarray(array, dtype=numpy.float64)
+    if not 0 <= ndecimals <= 22:
+        return numpy.vectorize(round)(array, ndecimals).astype(numpy.float64)
+
+    # Python rounds the exact decimal value of the float while rint rounds the
+    # scaled float. They only disagree when the scaled value is within its
+    # rounding error of a half, those few values are rounded by Python.
+    scale = 10.0**ndecimals
+    with numpy.errstate(over="ignore", invalid="ignore"):
+        scaled = array * scale
+        rounded = numpy.rint(scaled) / scale
+        distance = numpy.abs(scaled - numpy.floor(scaled) - 0.5)
+        exact = (distance > 1e-15 * numpy.abs(scaled)) & (numpy.abs(scaled) < 2**52)
+
+    if not numpy.all(exact):
+        fallback = ~exact
+        rounded[fallback] = [
+            round(value, ndecimals) for value in array[fallback].tolist()
+        ]
+    return rounded
+
+
+def _to_characters(values: list[float]) -> numpy.ndarray:
+    texts = numpy.array([str(value) for value in values], dtype="S")
+    return texts.view(numpy.uint8).reshape(len(texts), texts.itemsize)
+
+
+def _format_values(rounded: numpy.ndarray, ndecimals: int) -> numpy.ndarray:
+    """
+    Format the already rounded values like ``str`` does, with integer arithmetic.
+
+    Returns:
+        (N, W) ascii characters of the N values, padded with zero bytes.
+    """
+    values = rounded.ravel()
+    if not 0 <= ndecimals <= 15:
+        # the scaled integers wouldn't fit, or negative decimals would divide by
+        # a zero 10**ndecimals integer
+        return _to_characters(values.tolist())
+
+    with numpy.errstate(invalid="ignore", over="ignore"):
+        magnitude = numpy.abs(values)
+        scaled = numpy.rint(magnitude * 10.0**ndecimals)
+        # str() uses the exponent notation below 1e-4, and past 15 significant
+        # digits the decimals can't be derived from the scaled integer.
+        special = ~((scaled < 1e15) & ((magnitude >= 1e-4) | (magnitude == 0)))
+    scaled = numpy.where(special, 0, scaled)
+    # the usual values fit in 32 bits where the divisions are much faster
+    dtype = numpy.uint64
+    if scaled.max(initial=0) < 2**32 and ndecimals <= 9:
+        dtype = numpy.uint32
+    integer, fraction = numpy.divmod(scaled.astype(dtype), dtype(10**ndecimals))
+
+    # sign, integer digits, dot and at least one decimal, filled from the right
+    width = len(str(integer.max(initial=0)))
+    ndecimals_kept = max(ndecimals, 1)
+    characters = numpy.zeros((len(values), width + ndecimals_kept + 2), numpy.uint8)
+    characters[:, 0] = numpy.where(numpy.signbit(values), ord("-"), 0)
+    characters[:, width + 1] = ord(".")
+
+    # the trailing zeros of the decimals are removed
+    nonzero = numpy.zeros(len(values), dtype=bool)
+    for column in range(len(characters[0]) - 1, width + 1, -1):
+        fraction, digit = numpy.divmod(fraction, 10)
+        nonzero |= digit != 0
+        if column == width + 2:
+            nonzero[:] = True
+        characters[:, column] = numpy.where(nonzero, digit + ord("0"), 0)
+
+    for column in range(width, 0, -1):
+        remaining = integer
+        integer, digit = numpy.divmod(integer, 10)
+        leading = (remaining > 0) | (column == width)
+        characters[:, column] = numpy.where(leading, digit + ord("0"), 0)
+
+    if numpy.any(special):
+        texts = _to_characters(values[special].tolist())
+        if texts.shape[1] > characters.shape[1]:
+            padding = texts.shape[1] - characters.shape[1]
+            characters = numpy.pad(characters, ((0, 0), (0, padding)))
+        characters[special] = 0
+        characters[special, : texts.shape[1]] = texts
+    return characters
+
+
+def _format_batch(
+    array: numpy.ndarray,
+    ndecimals: int,
+    prefix: str,
+    separator: str,
+    suffix: str,
+) -> str:
+    """
+    Format each row of an (N, M) array as ``prefix + separator.join(values) +
+    suffix``, values being rounded with ``round`` then converted with ``str``.
+
+    Returns:
+        the N rows separated by newlines.
+    """
+    array = numpy.asarray(array)
+    if not len(array):
+        return ""
+    array = array.reshape(len(array), -1)
+    return "\n".join(
+        _format_batch_chunk(
+            array[start : start + FORMAT_CHUNK_SIZE],
+            ndecimals,
+            prefix,
+            separator,
+            suffix,
+        )
+        for start in range(0, len(array), FORMAT_CHUNK_SIZE)
+    )
+
+
+def _format_batch_chunk(
+    array: numpy.ndarray,
+    ndecimals: int,
+    prefix: str,
+    separator: str,
+    suffix: str,
+) -> str:
+    rows, columns = array.shape
+    array = array.astype(numpy.float64, copy=False)
+    fields = _format_values(_round_batch(array, ndecimals), ndecimals)
+    fields = fields.reshape(rows, columns, -1)
+
+    def _constant(text: str) -> numpy.ndarray:
+        characters = numpy.frombuffer(text.encode("utf-8"), dtype=numpy.uint8)
+        return numpy.broadcast_to(characters, (rows, len(characters)))
+
+    pieces = [_constant(prefix)]
+    for column in range(columns):
+        if column:
+            pieces.append(_constant(separator))
+        pieces.append(fields[:, column])
+    pieces.append(_constant(suffix + "\n"))
+    # all the rows are laid out in a fixed width, removing the padding bytes
+    # leaves the final text
+    characters = numpy.concatenate(pieces, axis=1).ravel()
+    return characters[characters != 0].tobytes().decode("utf-8")[:-1]
+
+
+def _format_batch_values(array: numpy.ndarray, ndecimals: int) -> list[str]:
+    """
+    Returns:
+        each value of the array rounded with ``round`` then converted with ``str``.
+    """
+    array = numpy.asarray(array).reshape(-1, 1)
+    if not len(array):
+        return []
+    return _format_batch(array, ndecimals, "", "", "").split("\n")
+
+
+def rgb_batch_to_single_line(array: numpy.ndarray, ndecimals: int) -> str:
+    """
+    Same as ``rgb_array_to_single_line`` for an (N, 3) array, rows separated by
+    newlines.
+    """
+    return _format_batch(array, ndecimals, "", " ", " 1.0")
+
+
+def rgb_batch_to_tuple(array: numpy.ndarray, ndecimals: int) -> str:
+    """
+    Same as ``rgb_array_to_tuple`` for an (N, 3) array, rows separated by
+    newlines.
+    """
+    return _format_batch(array, ndecimals, "(", ", ", ")")
+
+
+def xy_batch_to_tuple(array: numpy.ndarray, ndecimals: int) -> str:
+    """
+    Same as ``xy_array_to_tuple`` for an (N, 2) array, rows separated by newlines.
+    """
+    return _format_batch(array, ndecimals, "(", ", ", ")")
+
+
+def rgb_batch_to_nuke(
+    array: numpy.ndarray,
+    ndecimals: int,
+    node_names: Sequence[str],
+    node_labels: Sequence[str],
+    positions: Optional[numpy.ndarray] = None,
+) -> str:
+    """
+    Same as ``rgb_array_to_nuke`` for an (N, 3) array, nodes separated by
+    newlines.
+
+    Args:
+        array: (N, 3) rgb values
+        ndecimals: number of decimals of the rgb values
+        node_names: N node names
+        node_labels: N node labels
+        positions: (N, 2) integer xpos and ypos of the nodes, default to 0.
+    """
+    values = iter(_format_batch_values(array, ndecimals))
+    if positions is None:
+        positions = numpy.zeros((len(array), 2), dtype=numpy.int64)
+    coordinates = map(str, numpy.asarray(positions).ravel().tolist())
+    labels = (repr(label)[1:][:-1] for label in node_labels)
+    template = """
+Constant {{
+ inputs 0
+ channels rgb
+ color {{{} {} {} 1}}
+ color_panelDropped true
+ name {}
+ label "{}"
+ selected true
+ xpos {}
+ ypos {}
+}}"""
+    return "\n".join(
+        template.format(r, g, b, name, label, xpos, ypos)
+        for r, g, b, name, label, xpos, ypos in zip(
+            values, values, values, node_names, labels, coordinates, coordinates
+        )
+    )
+
+
+def get_nuke_node_name(CCT: float, colorspace_name: str, use_daylight: bool) -> str:
+    if use_daylight:
+        mode = "Daylight"
+    else:
+        mode = "Planckian"
+
+    nuke_node_name = "CCT"
+    nuke_node_name += f"_{mode[0]}"
+    nuke_node_name += f"_{CCT}".replace(".", "d")
+    nuke_node_name += f"__{colorspace_name}".replace(" ", "_")
+
+    return nuke_node_name
+
+
+def get_nuke_node_label(
+    CCT: float,
+    colorspace_name: str,
+    use_daylight: bool,
+    tint: float,
+) -> str:
+    if use_daylight:
+        mode = "Daylight"
+    else:
+        mode = "Planckian"
+
+    nuke_node_name = "CCT"
+    nuke_node_name += f" {CCT}"
+    nuke_node_name += f" {colorspace_name}"
+    nuke_node_name += f" ({mode})"
+    if not use_daylight:
+        nuke_node_name += f":tint={tint}"
+
+    return nuke_node_name
@@ -0,0 +1,6 @@
+from ._server import ConversionParameters
+from ._server import ConversionService
+from ._server import convert
+from ._server import serve
+from ._server import start_server
+from ._main import main
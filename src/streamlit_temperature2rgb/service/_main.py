@@ -0,0 +1,32 @@
+import argparse
+import asyncio
+import logging
+from typing import Optional
+
+import colour
+
+from ._server import serve
+
+
+def get_cli(argv: Optional[list[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        prog="temperature2rgb-service",
+        description="Serve Kelvin temperatures to RGB conversions over HTTP.",
+    )
+    parser.add_argument(
+        "--host",
+        default="127.0.0.1",
+        help="interface to listen on, default to localhost only.",
+    )
+    parser.add_argument("--port", type=int, default=8765)
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[list[str]] = None):
+    cli = get_cli(argv)
+    logging.basicConfig(level=logging.INFO)
+    colour.utilities.filter_warnings(colour_usage_warnings=True, python_warnings=True)
+    try:
+        asyncio.run(serve(cli.host, cli.port))
+    except KeyboardInterrupt:
+        pass
@@ -0,0 +1,481 @@
+import asyncio
+import concurrent.futures
+import dataclasses
+import hashlib
+import http
+import json
+import logging
+import urllib.parse
+from typing import Any
+from typing import Awaitable
+from typing import Callable
+from typing import Optional
+
+import colour
+import numpy
+
+from streamlit_temperature2rgb.core import FLOAT32_DOMAINS
+from streamlit_temperature2rgb.core import LOCI
+from streamlit_temperature2rgb.core import PLANCKIAN_BACKENDS
+from streamlit_temperature2rgb.core import convert_cct_batch
+from streamlit_temperature2rgb.core import get_whitepoint
+
+LOGGER = logging.getLogger(__name__)
+
+MAX_BODY_SIZE = 256 * 1024 * 1024
+"""
+Maximum size in bytes of a request body.
+"""
+
+TINT_RANGE = (-150.0, 150.0)
+"""
+Accepted tints in the app units, the Duv range of the Planckian locus in the app.
+"""
+
+BINARY_CONTENT_TYPE = "application/octet-stream"
+
+_ILLUMINANTS = colour.CCS_ILLUMINANTS["CIE 1931 2 Degree Standard Observer"]
+_OUTPUTS = ("rgb", "xy", "XYZ")
+
+
+class BadRequestError(ValueError):
+    pass
+
+
+@dataclasses.dataclass(frozen=True)
+class ConversionParameters:
+    """
+    Same options as the app sidebar, validated and hashable.
+    """
+
+    colorspace: str = "sRGB"
+    illuminant: Optional[str] = None
+    cat: str = "Bradford"
+    locus: str = "Planckian"
+    normalize: bool = True
+    backend: str = "reference"
+
+    @classmethod
+    def from_mapping(cls, mapping: dict[str, Any]) -> "ConversionParameters":
+        def _get_choice(name, choices):
+            value = mapping.get(name, getattr(cls, name))
+            if value is not None and value not in choices:
+                raise BadRequestError(
+                    f"invalid {name} {value!r}, expected one of {sorted(choices)}"
+                )
+            return value
+
+        normalize = mapping.get("normalize", cls.normalize)
+        if isinstance(normalize, str):
+            normalize = normalize.lower() not in ("0", "false", "no")
+
+        illuminant = mapping.get("illuminant")
+        if illuminant in ("", "colorspace"):
+            illuminant = None
+        if illuminant is not None and illuminant not in _ILLUMINANTS:
+            raise BadRequestError(
+                f"invalid illuminant {illuminant!r}, "
+                f"expected one of {sorted(_ILLUMINANTS)}"
+            )
+
+        return cls(
+            colorspace=_get_choice("colorspace", colour.RGB_COLOURSPACES),
+            illuminant=illuminant,
+            cat=_get_choice("cat", colour.CHROMATIC_ADAPTATION_TRANSFORMS),
+            locus=_get_choice("locus", LOCI),
+            normalize=bool(normalize),
+            backend=_get_choice("backend", PLANCKIAN_BACKENDS),
+        )
+
+
+def convert(
+    temperatures: numpy.ndarray,
+    tints: numpy.ndarray,
+    parameters: ConversionParameters,
+) -> dict[str, numpy.ndarray]:
+    """
+    Args:
+        temperatures: (N,) array of temperatures in kelvins
+        tints: array broadcastable to temperatures, in the app units (-150..150)
+        parameters: how to convert
+
+    Returns:
+        mapping of output name to (N, 2) or (N, 3) float64 array.
+    """
+    colorspace: colour.RGB_Colourspace = colour.RGB_COLOURSPACES[parameters.colorspace]
+    result = convert_cct_batch(
+        temperatures,
+        colorspace=colorspace,
+        illuminant=get_whitepoint(parameters.illuminant, colorspace),
+        cat=parameters.cat,
+        tint=numpy.asarray(tints, dtype=numpy.float64) / 3000,
+        locus=parameters.locus,
+        normalize=parameters.normalize,
+        backend=parameters.backend,
+    )
+    return {"rgb": result.rgb, "xy": result.xy, "XYZ": result.XYZ}
+
+
+@dataclasses.dataclass
+class Request:
+    method: str
+    path: str
+    query: dict[str, str]
+    headers: dict[str, str]
+    body: bytes
+
+    @property
+    def keep_alive(self) -> bool:
+        return self.headers.get("connection", "").lower() != "close"
+
+    def wants_binary(self) -> bool:
+        return BINARY_CONTENT_TYPE in self.headers.get("accept", "")
+
+
+@dataclasses.dataclass
+class Response:
+    status: http.HTTPStatus
+    body: bytes
+    content_type: str = "application/json"
+    headers: dict[str, str] = dataclasses.field(default_factory=dict)
+
+    @classmethod
+    def from_json(cls, data, status=http.HTTPStatus.OK) -> "Response":
+        return cls(status=status, body=json.dumps(data).encode("utf-8"))
+
+    @classmethod
+    def from_array(cls, array: numpy.ndarray) -> "Response":
+        array = numpy.ascontiguousarray(array, dtype="<f8")
+        return cls(
+            status=http.HTTPStatus.OK,
+            body=array.tobytes(),
+            content_type=BINARY_CONTENT_TYPE,
+            headers={
+                "X-Array-Shape": ",".join(str(size) for size in array.shape),
+                "X-Array-Dtype": "<f8",
+            },
+        )
+
+    def to_bytes(self, keep_alive: bool) -> bytes:
+        headers = {
+            "Content-Type": self.content_type,
+            "Content-Length": str(len(self.body)),
+            "Connection": "keep-alive" if keep_alive else "close",
+            **self.headers,
+        }
+        lines = [f"HTTP/1.1 {self.status.value} {self.status.phrase}"]
+        lines += [f"{name}: {value}" for name, value in headers.items()]
+        return ("\r\n".join(lines) + "\r\n\r\n").encode("latin-1") + self.body
+
+
+async def _read_request(reader: asyncio.StreamReader) -> Optional[Request]:
+    request_line = await reader.readline()
+    if not request_line.strip():
+        return None
+
+    try:
+        method, target, _ = request_line.decode("latin-1").split(" ", 2)
+    except ValueError:
+        raise BadRequestError(f"invalid request line {request_line!r}")
+
+    headers = {}
+    while True:
+        line = await reader.readline()
+        if line in (b"\r\n", b"\n", b""):
+            break
+        name, _, value = line.decode("latin-1").partition(":")
+        headers[name.strip().lower()] = value.strip()
+
+    length = headers.get("content-length", "0")
+    # int() would also accept signs, spaces and underscores
+    if not (length.isascii() and length.isdigit()):
+        raise BadRequestError(f"invalid content-length {length!r}")
+    length = int(length)
+    if length > MAX_BODY_SIZE:
+        raise BadRequestError(f"body larger than {MAX_BODY_SIZE} bytes")
+    body = await reader.readexactly(length) if length else b""
+
+    url = urllib.parse.urlsplit(target)
+    query = dict(urllib.parse.parse_qsl(url.query))
+    return Request(
+        method=method.upper(),
+        path=url.path,
+        query=query,
+        headers=headers,
+        body=body,
+    )
+
+
+class ConversionService:
+    """
+    Stateless HTTP service exposing ``streamlit_temperature2rgb.core`` conversions.
+
+    Endpoints:
+        - ``GET /health``
+        - ``GET|POST /convert``: a single temperature. Parameters are given as query
+          parameters or a JSON object: ``temperature``, ``tint`` and the
+          ``ConversionParameters`` fields.
+        - ``POST /batch``: many temperatures. Either a JSON object with
+          ``temperatures``, optional ``tints`` and the ``ConversionParameters``
+          fields, or a binary body of little-endian float64 temperatures with the
+          other parameters as query parameters.
+
+    Responses are JSON unless the request ``Accept`` header asks for
+    ``application/octet-stream``, in which case the ``output`` query parameter
+    (rgb by default) is returned as raw little-endian float64 values, with its
+    shape in the ``X-Array-Shape`` header.
+
+    Temperatures must be within the ``FLOAT32_DOMAINS`` of the locus and tints
+    within ``TINT_RANGE``, invalid requests are answered with a 400 status and an
+    ``error`` message.
+
+    Identical requests being processed at the same time are only computed once.
+
+    Args:
+        max_workers: number of threads computing conversions.
+    """
+
+    def __init__(self, max_workers: Optional[int] = None):
+        self._executor = concurrent.futures.ThreadPoolExecutor(
+            max_workers=max_workers,
+            thread_name_prefix="temperature2rgb-service",
+        )
+        self._in_flight: dict[tuple, asyncio.Future] = {}
+        self.coalesced_requests = 0
+        self._routes: dict[tuple[str, str], Callable[[Request], Awaitable]] = {
+            ("GET", "/health"): self._handle_health,
+            ("GET", "/convert"): self._handle_convert,
+            ("POST", "/convert"): self._handle_convert,
+            ("POST", "/batch"): self._handle_batch,
+        }
+
+    async def _compute(self, key: tuple, function: Callable, *args):
+        """
+        Run the function in the executor, sharing the result with all the concurrent
+        calls using the same key.
+        """
+        future = self._in_flight.get(key)
+        if future is not None:
+            self.coalesced_requests += 1
+            return await asyncio.shield(future)
+
+        loop = asyncio.get_running_loop()
+        future = loop.run_in_executor(self._executor, function, *args)
+        self._in_flight[key] = future
+        try:
+            return await asyncio.shield(future)
+        finally:
+            if self._in_flight.get(key) is future:
+                del self._in_flight[key]
+
+    async def _handle_health(self, request: Request) -> Response:
+        return Response.from_json({"status": "ok"})
+
+    async def _handle_convert(self, request: Request) -> Response:
+        mapping = dict(request.query)
+        if request.body:
+            mapping.update(_parse_json_object(request.body))
+
+        if "temperature" not in mapping:
+            raise BadRequestError("missing 'temperature' parameter")
+        parameters = ConversionParameters.from_mapping(mapping)
+        temperature = _parse_temperatures(
+            mapping["temperature"], "temperature", parameters
+        )
+        tint = _parse_tints(mapping.get("tint", 0.0), "tint")
+        if temperature.ndim or tint.ndim:
+            raise BadRequestError("'temperature' and 'tint' must be single numbers")
+        temperature, tint = float(temperature), float(tint)
+
+        outputs = await self._compute(
+            ("convert", temperature, tint, parameters),
+            convert,
+            numpy.array([temperature]),
+            numpy.array([tint]),
+            parameters,
+        )
+        if request.wants_binary():
+            return Response.from_array(_get_output(outputs, request)[0])
+
+        return Response.from_json(
+            {
+                "temperature": temperature,
+                "tint": tint,
+                **{name: array[0].tolist() for name, array in outputs.items()},
+            }
+        )
+
+    async def _handle_batch(self, request: Request) -> Response:
+        mapping = dict(request.query)
+        if request.headers.get("content-type", "").startswith(BINARY_CONTENT_TYPE):
+            if len(request.body) % 8:
+                raise BadRequestError("binary body must be float64 values")
+            parameters = ConversionParameters.from_mapping(mapping)
+            temperatures = _parse_temperatures(
+                numpy.frombuffer(request.body, dtype="<f8"), "temperatures", parameters
+            )
+            tints = _parse_tints(mapping.get("tint", 0.0), "tint")
+            if tints.ndim:
+                raise BadRequestError("'tint' must be a single number")
+        else:
+            mapping.update(_parse_json_object(request.body))
+            if "temperatures" not in mapping:
+                raise BadRequestError("missing 'temperatures' list")
+            parameters = ConversionParameters.from_mapping(mapping)
+            temperatures = _parse_temperatures(
+                mapping["temperatures"], "temperatures", parameters
+            )
+            tints = _parse_tints(mapping.get("tints", 0.0), "tints")
+            try:
+                temperatures, tints = numpy.broadcast_arrays(
+                    temperatures.reshape(-1), tints.reshape(-1)
+                )
+            except ValueError:
+                raise BadRequestError(
+                    f"expected a single tint or one per temperature, got "
+                    f"{tints.size} tints for {temperatures.size} temperatures"
+                )
+
+        digest = hashlib.sha1(temperatures.tobytes() + numpy.asarray(tints).tobytes())
+        outputs = await self._compute(
+            ("batch", digest.hexdigest(), parameters),
+            convert,
+            temperatures,
+            tints,
+            parameters,
+        )
+        if request.wants_binary():
+            return Response.from_array(_get_output(outputs, request))
+
+        return Response.from_json(
+            {name: array.tolist() for name, array in outputs.items()}
+        )
+
+    async def handle_request(self, request: Request) -> Response:
+        handler = self._routes.get((request.method, request.path))
+        if handler is None:
+            if any(path == request.path for _, path in self._routes):
+                status = http.HTTPStatus.METHOD_NOT_ALLOWED
+            else:
+                status = http.HTTPStatus.NOT_FOUND
+            return Response.from_json({"error": status.phrase}, status=status)
+
+        try:
+            return await handler(request)
+        except BadRequestError as error:
+            return Response.from_json(
+                {"error": str(error)}, status=http.HTTPStatus.BAD_REQUEST
+            )
+        except Exception:
+            LOGGER.exception(f"error while handling {request.method} {request.path}")
+            status = http.HTTPStatus.INTERNAL_SERVER_ERROR
+            return Response.from_json({"error": status.phrase}, status=status)
+
+    async def handle_connection(
+        self,
+        reader: asyncio.StreamReader,
+        writer: asyncio.StreamWriter,
+    ):
+        try:
+            while True:
+                try:
+                    request = await _read_request(reader)
+                except BadRequestError as error:
+                    response = Response.from_json(
+                        {"error": str(error)}, status=http.HTTPStatus.BAD_REQUEST
+                    )
+                    writer.write(response.to_bytes(keep_alive=False))
+                    break
+                if request is None:
+                    break
+
+                response = await self.handle_request(request)
+                writer.write(response.to_bytes(keep_alive=request.keep_alive))
+                await writer.drain()
+                if not request.keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+    def shutdown(self):
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+
+def _parse_json_object(body: bytes) -> dict:
+    try:
+        data = json.loads(body)
+    except ValueError as error:
+        raise BadRequestError(f"invalid JSON body: {error}")
+    if not isinstance(data, dict):
+        raise BadRequestError("JSON body must be an object")
+    return data
+
+
+def _parse_numbers(value, name: str) -> numpy.ndarray:
+    if isinstance(value, bool):
+        raise BadRequestError(f"'{name}' must be numbers")
+    try:
+        return numpy.asarray(value, dtype="<f8")
+    except (TypeError, ValueError):
+        raise BadRequestError(f"'{name}' must be numbers")
+
+
+def _check_range(array: numpy.ndarray, name: str, bounds: tuple[float, float]):
+    # also rejects NaN
+    if not numpy.all((array >= bounds[0]) & (array <= bounds[1])):
+        raise BadRequestError(
+            f"'{name}' must be between {bounds[0]:g} and {bounds[1]:g}"
+        )
+
+
+def _parse_temperatures(
+    value, name: str, parameters: ConversionParameters
+) -> numpy.ndarray:
+    """
+    Temperatures within the domain of the locus of the parameters.
+    """
+    temperatures = _parse_numbers(value, name)
+    _check_range(temperatures, name, FLOAT32_DOMAINS[parameters.locus][0])
+    return temperatures
+
+
+def _parse_tints(value, name: str) -> numpy.ndarray:
+    """
+    Tints within ``TINT_RANGE``.
+    """
+    tints = _parse_numbers(value, name)
+    _check_range(tints, name, TINT_RANGE)
+    return tints
+
+
+def _get_output(outputs: dict[str, numpy.ndarray], request: Request) -> numpy.ndarray:
+    name = request.query.get("output", "rgb")
+    if name not in _OUTPUTS:
+        raise BadRequestError(f"invalid output {name!r}, expected one of {_OUTPUTS}")
+    return outputs[name]
+
+
+async def start_server(
+    host: str = "127.0.0.1",
+    port: int = 8765,
+    service: Optional[ConversionService] = None,
+) -> asyncio.Server:
+    """
+    Start listening for requests, use port 0 to pick any free port.
+    """
+    service = service or ConversionService()
+    return await asyncio.start_server(service.handle_connection, host, port)
+
+
+async def serve(host: str = "127.0.0.1", port: int = 8765):
+    service = ConversionService()
+    server = await start_server(host, port, service=service)
+    address = server.sockets[0].getsockname()
+    LOGGER.info(f"serving on http://{address[0]}:{address[1]}")
+    try:
+        async with server:
+            await server.serve_forever()
+    finally:
+        service.shutdown()
@@ -1,3 +1,10 @@
 from ._config import UserConfig
 from ._config import config
+from ._config import stage_cache
 from ._main import create_main_interface
+from ._warmup import start_warmup
+from ._warmup import record_boot_timing
+from ._warmup import get_boot_timings
+from ._metrics import get_metrics
+from ._metrics import export_metrics
+from ._metrics import write_metrics
@@ -0,0 +1,113 @@
+import streamlit
+
+from streamlit_temperature2rgb.core import image_to_npy
+from streamlit_temperature2rgb.core import image_to_png16
+from ._config import config
+from ._config import stage_cache
+from ._controller import ConversionResult
+
+CHART_KINDS = ("Kelvin ramp", "Temperature × tint chart")
+EXPORT_FORMATS = {
+    "16-bit PNG": ("png", "image/png"),
+    "Float .npy (linear)": ("npy", "application/octet-stream"),
+}
+PREVIEW_WIDTH = 800
+MAX_EXPORT_SIDE = 16384
+MAX_EXPORT_PIXELS = 4096 * 4096
+"""
+Largest image rendered for export, 384MB as float64, for the whole image is held
+in memory by the shared server before being encoded.
+"""
+
+
+def _create_image(result: ConversionResult, kind, CCT_range, width, height):
+    if kind == CHART_KINDS[0]:
+        return result.get_kelvin_ramp(*CCT_range, width, height)
+    return result.get_cct_tint_chart(*CCT_range, width, height)
+
+
+def body_charts(result: ConversionResult):
+    expander = streamlit.expander(
+        "Kelvin ramp and chart", key="widget_chart_expanded", on_change="rerun"
+    )
+    with expander:
+        if not expander.open:
+            return
+
+        if config().USER_DAYLIGHT_MODE:
+            kinds = CHART_KINDS[:1]
+            bounds = (1667.0, 25000.0)
+        else:
+            kinds = CHART_KINDS
+            bounds = (798.0, 20000.0)
+
+        kind = streamlit.radio(
+            "Image", options=kinds, horizontal=True, key="widget_chart_kind"
+        )
+        CCT_range = streamlit.slider(
+            "Temperatures (K)",
+            min_value=bounds[0],
+            max_value=bounds[1],
+            value=(max(bounds[0], 1000.0), 10000.0),
+            step=100.0,
+            key="widget_chart_range",
+        )
+        is_ramp = kind == CHART_KINDS[0]
+        preview_height = PREVIEW_WIDTH // 10 if is_ramp else PREVIEW_WIDTH // 2
+
+        # the images depend on all the user options but the temperature, and the
+        # tint for the chart
+        key = result.get_key()._replace(CCT=None)
+        if not is_ramp:
+            key = key._replace(tint=None)
+        preview_inputs = (key, kind, CCT_range)
+        preview = stage_cache().get(
+            "chart_preview",
+            preview_inputs,
+            lambda: image_to_png16(
+                _create_image(result, kind, CCT_range, PREVIEW_WIDTH, preview_height)
+            ),
+        )
+        streamlit.image(preview, width="stretch")
+        if not is_ramp:
+            streamlit.caption("Tint from +150 (top) to -150 (bottom).")
+
+        column1, column2, column3 = streamlit.columns(3)
+        with column1:
+            width = streamlit.number_input(
+                "Width", min_value=1, max_value=MAX_EXPORT_SIDE, value=4096, step=256
+            )
+        with column2:
+            height = streamlit.number_input(
+                "Height",
+                min_value=1,
+                max_value=MAX_EXPORT_SIDE,
+                value=256 if is_ramp else 2048,
+                step=256,
+            )
+        with column3:
+            export_format = streamlit.selectbox("Format", options=list(EXPORT_FORMATS))
+
+        export_inputs = (*preview_inputs, width, height, export_format)
+        extension, mime = EXPORT_FORMATS[export_format]
+        if width * height > MAX_EXPORT_PIXELS:
+            streamlit.error(
+                f"Exports are limited to {MAX_EXPORT_PIXELS:,} pixels, reduce the"
+                f" width or height ({width * height:,} pixels)."
+            )
+            return
+
+        if streamlit.button("Render for export"):
+            image = _create_image(result, kind, CCT_range, width, height)
+            data = image_to_png16(image) if extension == "png" else image_to_npy(image)
+            streamlit.session_state["__CHART_EXPORT"] = (export_inputs, data)
+
+        export = streamlit.session_state.get("__CHART_EXPORT")
+        if export is not None and export[0] == export_inputs:
+            name = "kelvin_ramp" if is_ramp else "cct_tint_chart"
+            streamlit.download_button(
+                "Download",
+                data=export[1],
+                file_name=f"{name}_{CCT_range[0]:.0f}-{CCT_range[1]:.0f}K.{extension}",
+                mime=mime,
+            )
@@ -0,0 +1,126 @@
+import base64
+import functools
+import itertools
+
+import colour
+import numpy
+import streamlit
+
+from streamlit_temperature2rgb.core import normalize_rgb
+from streamlit_temperature2rgb.core import rgb_array_to_png
+from streamlit_temperature2rgb.core import rgb_batch_to_single_line
+from streamlit_temperature2rgb.core import rgb_batch_to_tuple
+from ._config import ChromaticAdaptationTransforms
+from ._config import Colorspaces
+from ._config import Illuminants
+from ._config import config
+from ._config import stage_cache
+from ._controller import ConversionResult
+
+
+@functools.lru_cache(maxsize=64)
+def _get_srgb_matrix(colorspace: Colorspaces) -> numpy.ndarray:
+    return colour.matrix_RGB_to_RGB(
+        colour.RGB_COLOURSPACES[colorspace.as_core()],
+        colour.RGB_COLOURSPACES["sRGB"],
+        chromatic_adaptation_transform="Bradford",
+    )
+
+
+@functools.lru_cache(maxsize=4096)
+def _get_swatch(srgb: tuple[float, float, float]) -> str:
+    png = rgb_array_to_png(numpy.asarray(srgb), 1, 1)
+    return "data:image/png;base64," + base64.b64encode(png).decode("ascii")
+
+
+def _get_swatches(rgb: numpy.ndarray, colorspaces: list[Colorspaces]) -> list[str]:
+    # displayed like the preview: converted to sRGB, normalized, 2.2 power function
+    matrices = numpy.stack([_get_srgb_matrix(colorspace) for colorspace in colorspaces])
+    srgb = normalize_rgb(numpy.einsum("aij,a...j->a...i", matrices, rgb))
+    return [_get_swatch(tuple(color)) for color in srgb.reshape(-1, 3).tolist()]
+
+
+def _create_table(result: ConversionResult, colorspaces, illuminants, cats) -> dict:
+    rgb = result.get_comparison(
+        [colorspace.as_core() for colorspace in colorspaces],
+        [illuminant.as_core() for illuminant in illuminants],
+        [cat.as_core() for cat in cats],
+    )
+    ndecimals = config().USER_NDECIMALS
+    rows = list(itertools.product(colorspaces, illuminants, cats))
+    flat = rgb.reshape(-1, 3)
+    return {
+        "Swatch": _get_swatches(rgb, colorspaces),
+        "Colorspace": [row[0].as_label() for row in rows],
+        "Illuminant": [row[1].as_label() for row in rows],
+        "CAT": [row[2].as_label() for row in rows],
+        "R": flat[:, 0],
+        "G": flat[:, 1],
+        "B": flat[:, 2],
+        "RGB tuple": rgb_batch_to_tuple(flat, ndecimals).split("\n"),
+        "RGBA Katana": rgb_batch_to_single_line(flat, ndecimals).split("\n"),
+    }
+
+
+def body_comparison(result: ConversionResult):
+    expander = streamlit.expander(
+        "Compare colorspaces, illuminants and CATs",
+        key="widget_comparison_expanded",
+        on_change="rerun",
+    )
+    with expander:
+        if not expander.open:
+            return
+
+        colorspaces = streamlit.multiselect(
+            "Colorspaces",
+            options=list(Colorspaces),
+            default=list(Colorspaces),
+            format_func=Colorspaces.as_label,
+            key="widget_comparison_colorspaces",
+        )
+        illuminants = streamlit.multiselect(
+            "Illuminants",
+            options=list(Illuminants),
+            default=list(Illuminants),
+            format_func=Illuminants.as_label,
+            key="widget_comparison_illuminants",
+        )
+        cats = streamlit.multiselect(
+            "Chromatic adaptation transforms",
+            options=list(ChromaticAdaptationTransforms),
+            default=list(ChromaticAdaptationTransforms),
+            format_func=ChromaticAdaptationTransforms.as_label,
+            key="widget_comparison_cats",
+        )
+        if not (colorspaces and illuminants and cats):
+            streamlit.info("Select at least one of each.")
+            return
+
+        # every target option of the key is replaced by the selections
+        key = result.get_key()._replace(colorspace=None, illuminant=None, cat=None)
+        inputs = (key, tuple(colorspaces), tuple(illuminants), tuple(cats))
+        inputs += (config().USER_NDECIMALS,)
+        table = stage_cache().get(
+            "comparison",
+            inputs,
+            lambda: _create_table(result, colorspaces, illuminants, cats),
+        )
+        streamlit.caption(
+            "Click a column header to sort. Swatches are converted to sRGB and "
+            "normalized like the preview."
+        )
+        streamlit.dataframe(
+            table,
+            hide_index=True,
+            width="stretch",
+            column_config={
+                "Swatch": streamlit.column_config.ImageColumn(width=40),
+                **{
+                    channel: streamlit.column_config.NumberColumn(
+                        format=f"%.{config().USER_NDECIMALS}f"
+                    )
+                    for channel in "RGB"
+                },
+            },
+        )
@@ -1,5 +1,6 @@
 import streamlit
 
+from streamlit_temperature2rgb._utils import StageCache
 from streamlit_temperature2rgb._utils import UifiedEnum
 
 
@@ -30,26 +31,26 @@ class ChromaticAdaptationTransforms(UifiedEnum):
     Bianco2010 = ("Bianco 2010", "Bianco 2010")
 
 
+DEFAULT_CONFIG = {
+    "USER_TEMPERATURE": 2500.0,
+    "USER_DAYLIGHT_MODE": False,
+    "USER_TINT": 0.0,
+    "USER_ILLUMINANT_NAME": Illuminants.colorspace,
+    "USER_NDECIMALS": 3,
+    "USER_NORMALIZE": True,
+    "USER_CAT_NAME": ChromaticAdaptationTransforms.Bradford,
+    "USER_COLORSPACE_NAME": Colorspaces.sRGB,
+}
+"""
+Value of each option for a new session.
+"""
+
+
 class UserConfig:
     def __init__(self):
-        if "USER_TEMPERATURE" not in streamlit.session_state:
-            streamlit.session_state["USER_TEMPERATURE"] = 2500.0
-        if "USER_DAYLIGHT_MODE" not in streamlit.session_state:
-            streamlit.session_state["USER_DAYLIGHT_MODE"] = False
-        if "USER_TINT" not in streamlit.session_state:
-            streamlit.session_state["USER_TINT"] = 0.0
-        if "USER_ILLUMINANT_NAME" not in streamlit.session_state:
-            streamlit.session_state["USER_ILLUMINANT_NAME"] = Illuminants.colorspace
-        if "USER_NDECIMALS" not in streamlit.session_state:
-            streamlit.session_state["USER_NDECIMALS"] = 3
-        if "USER_NORMALIZE" not in streamlit.session_state:
-            streamlit.session_state["USER_NORMALIZE"] = True
-        if "USER_CAT_NAME" not in streamlit.session_state:
-            streamlit.session_state[
-                "USER_CAT_NAME"
-            ] = ChromaticAdaptationTransforms.Bradford
-        if "USER_COLORSPACE_NAME" not in streamlit.session_state:
-            streamlit.session_state["USER_COLORSPACE_NAME"] = Colorspaces.sRGB
+        for key, value in DEFAULT_CONFIG.items():
+            if key not in streamlit.session_state:
+                streamlit.session_state[key] = value
 
     @property
     def USER_TEMPERATURE(self) -> float:
@@ -126,3 +127,12 @@ def config(force_instance: bool = False) -> UserConfig:
     if "__USER_CONFIG" not in streamlit.session_state or force_instance:
         streamlit.session_state["__USER_CONFIG"] = UserConfig()
     return streamlit.session_state["__USER_CONFIG"]
+
+
+def stage_cache() -> StageCache:
+    """
+    Return the stages computed during the previous reruns of this session.
+    """
+    if "__STAGE_CACHE" not in streamlit.session_state:
+        streamlit.session_state["__STAGE_CACHE"] = StageCache()
+    return streamlit.session_state["__STAGE_CACHE"]
@@ -1,13 +1,236 @@
+import concurrent.futures
+import io
+from typing import NamedTuple
+from typing import Optional
+
 import colour
+import numpy
+import PIL.Image
 
 from . import config
+from . import stage_cache
+from streamlit_temperature2rgb._metrics import METRICS
+from streamlit_temperature2rgb._metrics import StageTimer
+from streamlit_temperature2rgb._utils import LRUCache
+from streamlit_temperature2rgb._utils import StageCache
+from streamlit_temperature2rgb.core import BaseCCTConversion
 from streamlit_temperature2rgb.core import PlanckianCCTConversion
 from streamlit_temperature2rgb.core import DaylightCCTConversion
+from streamlit_temperature2rgb.core import CCTBatchResult
+from streamlit_temperature2rgb.core import compare_targets
+from streamlit_temperature2rgb.core import convert_cct_batch
+from streamlit_temperature2rgb.core import create_cct_tint_chart
+from streamlit_temperature2rgb.core import create_chromaticity_diagram_spec
+from streamlit_temperature2rgb.core import create_kelvin_ramp
+from streamlit_temperature2rgb.core import get_nuke_node_label
+from streamlit_temperature2rgb.core import get_nuke_node_name
+from streamlit_temperature2rgb.core import get_white_balance_matrix
+from streamlit_temperature2rgb.core import get_whitepoint
 from streamlit_temperature2rgb.core import rgb_array_to_image
-from streamlit_temperature2rgb.core import plot_cct_conversion
+from streamlit_temperature2rgb.core import rgb_array_to_png
+from streamlit_temperature2rgb.core import rgb_array_to_nuke
+from streamlit_temperature2rgb.core import rgb_array_to_single_line
+from streamlit_temperature2rgb.core import rgb_array_to_tuple
+from streamlit_temperature2rgb.core import xy_array_to_tuple
+
+
+class ConversionKey(NamedTuple):
+    """
+    Canonical, hashable, description of a conversion requested by the user.
+
+    Build it with ``from_user`` so equivalent requests produce equal keys.
+    """
+
+    CCT: float
+    colorspace: str
+    illuminant: Optional[str]
+    cat: str
+    tint: float
+    use_daylight: bool
+    normalize: bool
+    backend: Optional[str]
+
+    @classmethod
+    def from_user(
+        cls,
+        CCT,
+        colorspace_name,
+        illuminant_name,
+        cat,
+        tint,
+        use_daylight,
+        normalize,
+        backend,
+    ):
+        use_daylight = bool(use_daylight)
+        return cls(
+            # adding 0.0 to turn -0.0 to 0.0
+            CCT=float(CCT) + 0.0,
+            colorspace=colorspace_name.as_core(),
+            illuminant=illuminant_name.as_core(),
+            cat=cat.as_core(),
+            # the daylight locus ignore those
+            tint=0.0 if use_daylight else float(tint) + 0.0,
+            use_daylight=use_daylight,
+            normalize=bool(normalize),
+            backend=None if use_daylight else backend,
+        )
+
+
+class CachedConversion(NamedTuple):
+    conversion: BaseCCTConversion
+    rgb: numpy.ndarray
+    xy: numpy.ndarray
+
+
+UI_PLANCKIAN_BACKEND = "lut"
+"""
+Planckian backend used by the interface, max xy error of 2.5e-8, see PlanckianLUT.
+"""
+
+CONVERSION_CACHE = LRUCache(maxsize=512)
+"""
+Process-wide cache of ``CachedConversion`` shared by all the sessions.
+"""
+
+PREVIEW_CACHE = LRUCache(maxsize=512)
+"""
+Process-wide cache of encoded preview images shared by all the sessions.
+"""
+
+PLOT_CACHE = LRUCache(maxsize=64)
+"""
+Process-wide cache of the encoded chromaticity diagrams shared by all the sessions.
+"""
+
+PLOT_EXECUTOR = concurrent.futures.ThreadPoolExecutor(
+    max_workers=2, thread_name_prefix="temperature2rgb-plot"
+)
+"""
+Threads rendering the plots of all the sessions, so their reruns don't wait for it.
+"""
+
+
+class FormattedResult(NamedTuple):
+    rgb_tuple: str
+    rgb_single_line: str
+    xy_tuple: str
+    nuke: str
+
+
+def _image_to_png(image: numpy.ndarray) -> bytes:
+    # a barely bigger file for a much faster encoding
+    buffer = io.BytesIO()
+    PIL.Image.fromarray(image).save(buffer, format="PNG", compress_level=1)
+    return buffer.getvalue()
+
+
+def _render_plot_png(key: ConversionKey, conversion: BaseCCTConversion) -> bytes:
+    from streamlit_temperature2rgb.core import render_cct_conversion
+
+    # not part of any rerun, timed on its own
+    timer = StageTimer(metrics=METRICS)
+    with timer.stage("plot_render") as record:
+        return PLOT_CACHE.get_or_compute(
+            key,
+            record.track(
+                lambda: _image_to_png(render_cct_conversion(cct_conversion=conversion))
+            ),
+        )
+
+
+def _create_conversion(key: ConversionKey) -> BaseCCTConversion:
+    colorspace: colour.RGB_Colourspace = colour.RGB_COLOURSPACES[key.colorspace]
+    whitepoint = get_whitepoint(key.illuminant, colorspace)
+
+    if key.use_daylight:
+        conversion = DaylightCCTConversion(
+            CCT=key.CCT,
+            colorspace=colorspace,
+            illuminant=whitepoint,
+            cat=key.cat,
+        )
+    else:
+        conversion = PlanckianCCTConversion(
+            CCT=key.CCT,
+            colorspace=colorspace,
+            illuminant=whitepoint,
+            cat=key.cat,
+            tint=key.tint / 3000,
+            backend=key.backend,
+        )
+    # compute them now so they can be carried over by ``with_target``
+    conversion.XYZ
+    return conversion
+
+
+def _convert(
+    key: ConversionKey,
+    stages: StageCache,
+    timer: StageTimer,
+    namespace: str = "",
+) -> CachedConversion:
+    """
+    Compute the conversion for the given key, only recomputing the stages whose
+    inputs changed since the previous call with the same ``stages``.
+
+    Args:
+        key: what to convert
+        stages: previously computed stages
+        timer: records the duration of each stage
+        namespace: prefix for the target-dependent stage names, so different
+            targets don't evict each other.
+    """
+
+    def _get_stage(name: str, inputs, compute):
+        with timer.stage(name.removeprefix(namespace)) as record:
+            return stages.get(name, inputs, record.track(compute))
+
+    chromaticity_inputs = (key.CCT, key.tint, key.use_daylight, key.backend)
+    chromaticity = _get_stage(
+        "chromaticity",
+        chromaticity_inputs,
+        lambda: _create_conversion(key),
+    )
+
+    def _create_target_conversion():
+        colorspace = colour.RGB_COLOURSPACES[key.colorspace]
+        whitepoint = get_whitepoint(key.illuminant, colorspace)
+        conversion = chromaticity.with_target(colorspace, whitepoint, key.cat)
+        conversion.rgb
+        return conversion
+
+    target_inputs = (chromaticity_inputs, key.colorspace, key.illuminant, key.cat)
+    conversion = _get_stage(
+        f"{namespace}rgb",
+        target_inputs,
+        _create_target_conversion,
+    )
+
+    def _create_output():
+        if key.normalize:
+            rgb = conversion.rgb_normalized
+        else:
+            rgb = conversion.rgb
+
+        xy = conversion.xy
+        # shared between sessions, so make sure nobody mutates them
+        rgb.setflags(write=False)
+        xy.setflags(write=False)
+        return CachedConversion(conversion=conversion, rgb=rgb, xy=xy)
+
+    return _get_stage(f"{namespace}output", key, _create_output)
 
 
 class ConversionResult:
+    """
+    Args:
+        stages: stages computed for a previous result, to only recompute what
+            changed. Usually kept in the session.
+        timer: records the duration of the conversion stages, usually those of
+            the current rerun.
+    """
+
     def __init__(
         self,
         CCT,
@@ -17,6 +240,9 @@ class ConversionResult:
         tint,
         use_daylight,
         normalize,
+        backend="reference",
+        stages: Optional[StageCache] = None,
+        timer: Optional[StageTimer] = None,
     ):
         self._user_CCT = CCT
         self._user_colorspace_name = colorspace_name
@@ -25,63 +251,79 @@ class ConversionResult:
         self._user_tint = tint
         self._user_use_daylight = use_daylight
         self._user_normalize = normalize
+        self._backend = backend
+        self._stages = StageCache() if stages is None else stages
+        self._timer = StageTimer() if timer is None else timer
 
-        _colorspace = colorspace_name.as_core()
-        _colorspace: colour.RGB_Colourspace = colour.RGB_COLOURSPACES[_colorspace]
-
-        _whitepoint = illuminant_name.as_core()
-        if _whitepoint is None:
-            _whitepoint = _colorspace.whitepoint
-        else:
-            _whitepoint = colour.CCS_ILLUMINANTS["CIE 1931 2 Degree Standard Observer"][
-                _whitepoint
-            ]
-
-        _tint = tint / 3000
-
-        if use_daylight:
-            self._conversion = DaylightCCTConversion(
-                CCT=CCT,
-                colorspace=_colorspace,
-                illuminant=_whitepoint,
-                cat=cat.as_core(),
-            )
-        else:
-            self._conversion = PlanckianCCTConversion(
-                CCT=CCT,
-                colorspace=_colorspace,
-                illuminant=_whitepoint,
-                cat=cat.as_core(),
-                tint=_tint,
-            )
-
-        self._rgb_array = self._conversion.rgb
-        if normalize:
-            self._rgb_array = colour.algebra.normalise_maximum(
-                self._rgb_array, clip=True
+        self._key = ConversionKey.from_user(
+            CCT,
+            colorspace_name,
+            illuminant_name,
+            cat,
+            tint,
+            use_daylight,
+            normalize,
+            backend,
+        )
+        with self._timer.stage("conversion") as record:
+            cached = CONVERSION_CACHE.get_or_compute(
+                self._key,
+                record.track(lambda: _convert(self._key, self._stages, self._timer)),
             )
+        self._conversion = cached.conversion
+        self._rgb_array = cached.rgb
+        self._xy_array = cached.xy
 
-        self._xy_array = self._conversion.xy
+    def get_key(self) -> ConversionKey:
+        return self._key
 
     def get_cct_conversion(self):
         return self._conversion
 
+    def _get_preview_array(self):
+        # the preview is always normalized, whatever the user choice
+        key = self._key._replace(colorspace="sRGB", normalize=True)
+
+        def _compute():
+            return _convert(key, self._stages, self._timer, namespace="preview.")
+
+        with self._timer.stage("conversion") as record:
+            return CONVERSION_CACHE.get_or_compute(key, record.track(_compute)).rgb
+
     def get_preview_image(self, width: int, height: int):
-        conversion_preview = self.__class__(
-            self._user_CCT,
-            # only change :
-            self._user_colorspace_name.sRGB,
-            self._user_illuminant_name,
-            self._user_cat,
-            self._user_tint,
-            self._user_use_daylight,
-            self._user_normalize,
-        )
+        return rgb_array_to_image(self._get_preview_array(), width, height)
+
+    def get_preview_png(self, width: int, height: int) -> bytes:
+        def _compute():
+            return rgb_array_to_png(self._get_preview_array(), width, height)
+
+        with self._timer.stage("preview") as record:
+            return PREVIEW_CACHE.get_or_compute(
+                (self._key, width, height), record.track(_compute)
+            )
+
+    def get_formatted(self, ndecimals: int) -> FormattedResult:
+        """
+        Get all the string representations of the result.
+        """
+
+        def _format():
+            return FormattedResult(
+                rgb_tuple=rgb_array_to_tuple(self._rgb_array, ndecimals),
+                rgb_single_line=rgb_array_to_single_line(self._rgb_array, ndecimals),
+                xy_tuple=xy_array_to_tuple(self._xy_array, ndecimals),
+                nuke=rgb_array_to_nuke(
+                    self._rgb_array,
+                    ndecimals,
+                    node_name=self.get_nuke_node_name(),
+                    node_label=self.get_nuke_node_label(),
+                ),
+            )
 
-        array = conversion_preview.get_rgb_array()
-        array = colour.algebra.normalise_maximum(array, clip=True)
-        array = rgb_array_to_image(array, width, height)
-        return array
+        with self._timer.stage("formatted") as record:
+            return self._stages.get(
+                "formatted", (self._key, ndecimals), record.track(_format)
+            )
 
     def get_rgb_array(self):
         return self._rgb_array
@@ -90,39 +332,147 @@ class ConversionResult:
         return self._xy_array
 
     def get_nuke_node_name(self):
-        if self._user_use_daylight:
-            mode = "Daylight"
-        else:
-            mode = "Planckian"
+        return get_nuke_node_name(
+            self._user_CCT,
+            self._user_colorspace_name.as_core(),
+            self._user_use_daylight,
+        )
 
-        nuke_node_name = "CCT"
-        nuke_node_name += f"_{mode[0]}"
-        nuke_node_name += f"_{self._user_CCT}".replace(".", "d")
-        nuke_node_name += f"__{self._user_colorspace_name.as_core()}".replace(" ", "_")
+    def get_nuke_node_label(self):
+        return get_nuke_node_label(
+            self._user_CCT,
+            self._user_colorspace_name.as_core(),
+            self._user_use_daylight,
+            self._user_tint,
+        )
 
-        return nuke_node_name
+    def convert_range(self, CCT_min, CCT_max, count: int) -> CCTBatchResult:
+        """
+        Convert ``count`` temperatures evenly spaced from ``CCT_min`` to ``CCT_max``,
+        with all the other user options.
+        """
+        key = self._key
+        colorspace = colour.RGB_COLOURSPACES[key.colorspace]
+        return convert_cct_batch(
+            numpy.linspace(CCT_min, CCT_max, count),
+            colorspace=colorspace,
+            illuminant=get_whitepoint(key.illuminant, colorspace),
+            cat=key.cat,
+            tint=key.tint / 3000,
+            locus="Daylight" if key.use_daylight else "Planckian",
+            normalize=key.normalize,
+            backend=key.backend or "reference",
+        )
 
-    def get_nuke_node_label(self):
-        if self._user_use_daylight:
-            mode = "Daylight"
-        else:
-            mode = "Planckian"
+    def get_comparison(self, colorspaces, illuminants, cats) -> numpy.ndarray:
+        """
+        rgb values of the temperature in every combination of the given colorspace,
+        illuminant and cat core names, of shape (colorspaces, illuminants, cats, 3).
+        """
+        return compare_targets(
+            self._conversion.XYZ,
+            [colour.RGB_COLOURSPACES[name] for name in colorspaces],
+            illuminants,
+            cats,
+            normalize=self._key.normalize,
+        )
 
-        nuke_node_name = "CCT"
-        nuke_node_name += f" {self._user_CCT}"
-        nuke_node_name += f" {self._user_colorspace_name.as_core()}"
-        nuke_node_name += f" ({mode})"
-        if not self._user_use_daylight:
-            nuke_node_name += f":tint={self._user_tint}"
+    def get_kelvin_ramp(self, CCT_min, CCT_max, width: int, height: int):
+        """
+        Linear rgb image of the temperatures from ``CCT_min`` to ``CCT_max``, with
+        all the other user options.
+        """
+        key = self._key
+        colorspace = colour.RGB_COLOURSPACES[key.colorspace]
+        return create_kelvin_ramp(
+            CCT_min,
+            CCT_max,
+            width,
+            height,
+            colorspace=colorspace,
+            illuminant=get_whitepoint(key.illuminant, colorspace),
+            cat=key.cat,
+            tint=key.tint / 3000,
+            locus="Daylight" if key.use_daylight else "Planckian",
+            normalize=key.normalize,
+            backend=key.backend or "reference",
+        )
+
+    def get_cct_tint_chart(self, CCT_min, CCT_max, width: int, height: int):
+        """
+        Linear rgb image of the Planckian temperatures from ``CCT_min`` to
+        ``CCT_max`` horizontally, and the tint range vertically.
+        """
+        key = self._key
+        colorspace = colour.RGB_COLOURSPACES[key.colorspace]
+        return create_cct_tint_chart(
+            CCT_min,
+            CCT_max,
+            D_uv_min=-150 / 3000,
+            D_uv_max=150 / 3000,
+            width=width,
+            height=height,
+            colorspace=colorspace,
+            illuminant=get_whitepoint(key.illuminant, colorspace),
+            cat=key.cat,
+            normalize=key.normalize,
+            backend=self._backend,
+        )
 
-        return nuke_node_name
+    def get_white_balance_matrix(self, invert: bool = False) -> numpy.ndarray:
+        """
+        Matrix neutralizing the temperature color in the user colorspace, or
+        applying it if ``invert`` is True.
+        """
+        return get_white_balance_matrix(self._conversion, invert=invert)
 
     def get_cct_plot(self):
+        from streamlit_temperature2rgb.core import plot_cct_conversion
+
         figure, axes = plot_cct_conversion(cct_conversion=self._conversion)
         return figure, axes
 
+    def _get_plot_key(self) -> ConversionKey:
+        # the diagram doesn't depend on normalization
+        return self._key._replace(normalize=None)
+
+    def get_cct_plot_png(self) -> bytes:
+        """
+        Same as ``get_cct_plot`` but as a PNG image, much faster to produce and
+        shared by all the sessions through ``PLOT_CACHE``.
+        """
+        return _render_plot_png(self._get_plot_key(), self._conversion)
+
+    def get_cached_cct_plot_png(self) -> Optional[bytes]:
+        """
+        Returns:
+            the image of ``get_cct_plot_png`` if it was already rendered, else None.
+        """
+        return PLOT_CACHE.get(self._get_plot_key())
+
+    def submit_cct_plot_png(self) -> concurrent.futures.Future:
+        """
+        Same as ``get_cct_plot_png`` but rendered in the background by
+        ``PLOT_EXECUTOR``.
+
+        Returns:
+            future of the PNG bytes, can be cancelled as long as it is queued.
+        """
+        return PLOT_EXECUTOR.submit(
+            _render_plot_png, self._get_plot_key(), self._conversion
+        )
+
+    def get_cct_plot_spec(self) -> dict:
+        """
+        Same diagram as ``get_cct_plot`` but as a Vega-Lite spec rendered by the
+        browser, where only the marker changes between temperatures.
+        """
+        return create_chromaticity_diagram_spec(
+            self._key.colorspace, self.get_xy_array(), self._user_CCT
+        )
+
     @classmethod
-    def from_active_context(cls):
+    def from_active_context(cls, timer: Optional[StageTimer] = None):
         return cls(
             config().USER_TEMPERATURE,
             config().USER_COLORSPACE_NAME,
@@ -131,4 +481,7 @@ class ConversionResult:
             config().USER_TINT,
             config().USER_DAYLIGHT_MODE,
             config().USER_NORMALIZE,
+            backend=UI_PLANCKIAN_BACKEND,
+            stages=stage_cache(),
+            timer=timer,
         )
@@ -0,0 +1,108 @@
+import io
+
+import numpy
+import streamlit
+
+from streamlit_temperature2rgb.core import iter_cube_lut
+from streamlit_temperature2rgb.core import iter_nuke_script
+from streamlit_temperature2rgb.core import iter_table
+from ._config import config
+from ._controller import ConversionResult
+
+EXPORT_FORMATS = {
+    "Nuke script (.nk)": ("nk", "text/plain"),
+    "1D LUT (.cube)": ("cube", "text/plain"),
+    "CSV table": ("csv", "text/csv"),
+    "TSV table": ("tsv", "text/tab-separated-values"),
+}
+
+
+def _export(result: ConversionResult, export_format, CCT_range, count) -> bytes:
+    extension = EXPORT_FORMATS[export_format][0]
+    batch = result.convert_range(*CCT_range, count)
+    CCT = numpy.linspace(*CCT_range, count)
+    key = result.get_key()
+    ndecimals = config().USER_NDECIMALS
+
+    if extension == "nk":
+        chunks = iter_nuke_script(
+            CCT,
+            batch.rgb,
+            colorspace_name=key.colorspace,
+            use_daylight=key.use_daylight,
+            ndecimals=ndecimals,
+            tint=numpy.full(count, key.tint),
+        )
+    elif extension == "cube":
+        chunks = iter_cube_lut(
+            batch.rgb, *CCT_range, title=f"Temperature2RGB {key.colorspace}"
+        )
+    else:
+        chunks = iter_table(
+            CCT,
+            batch.rgb,
+            batch.xy,
+            ndecimals=ndecimals,
+            tint=numpy.full(count, key.tint),
+            delimiter="\t" if extension == "tsv" else ",",
+        )
+
+    buffer = io.BytesIO()
+    with io.TextIOWrapper(buffer, encoding="utf-8", newline="") as stream:
+        stream.writelines(chunks)
+        stream.flush()
+        return buffer.getvalue()
+
+
+def body_exports(result: ConversionResult):
+    expander = streamlit.expander(
+        "Export a range of temperatures",
+        key="widget_export_expanded",
+        on_change="rerun",
+    )
+    with expander:
+        if not expander.open:
+            return
+
+        bounds = (1667.0, 25000.0) if config().USER_DAYLIGHT_MODE else (798.0, 20000.0)
+        CCT_range = streamlit.slider(
+            "Temperatures (K)",
+            min_value=bounds[0],
+            max_value=bounds[1],
+            value=(max(bounds[0], 1000.0), 10000.0),
+            step=100.0,
+            key="widget_export_range",
+        )
+        column1, column2 = streamlit.columns(2)
+        with column1:
+            count = streamlit.number_input(
+                "Number of temperatures",
+                min_value=2,
+                max_value=1_000_000,
+                value=91,
+                key="widget_export_count",
+            )
+        with column2:
+            export_format = streamlit.selectbox(
+                "Format", options=list(EXPORT_FORMATS), key="widget_export_format"
+            )
+        streamlit.caption(
+            "Uses the current options, the rgb values are rounded to the chosen "
+            "decimals, except for the LUT."
+        )
+
+        export_inputs = (result.get_key()._replace(CCT=None), CCT_range, count)
+        export_inputs += (export_format, config().USER_NDECIMALS)
+        if streamlit.button("Export", key="widget_export_button"):
+            data = _export(result, export_format, CCT_range, count)
+            streamlit.session_state["__RANGE_EXPORT"] = (export_inputs, data)
+
+        export = streamlit.session_state.get("__RANGE_EXPORT")
+        if export is not None and export[0] == export_inputs:
+            extension, mime = EXPORT_FORMATS[export_format]
+            streamlit.download_button(
+                "Download",
+                data=export[1],
+                file_name=f"temperatures_{CCT_range[0]:.0f}-{CCT_range[1]:.0f}K.{extension}",
+                mime=mime,
+            )
@@ -1,15 +1,84 @@
+import contextlib
+import contextvars
+import time
+from typing import Iterator
+from typing import Optional
+
 import streamlit
 
 import streamlit_temperature2rgb
+from streamlit_temperature2rgb._metrics import METRICS
+from streamlit_temperature2rgb._metrics import StageTimer
 from streamlit_temperature2rgb._utils import widgetify
 from streamlit_temperature2rgb._utils import python_to_markdown_table
-from streamlit_temperature2rgb.core import rgb_array_to_tuple
-from streamlit_temperature2rgb.core import rgb_array_to_nuke
-from streamlit_temperature2rgb.core import rgb_array_to_single_line
-from streamlit_temperature2rgb.core import xy_array_to_tuple
 from streamlit_temperature2rgb.ui import config
 from ._sidebar import create_sidebar
+from ._controller import ConversionKey
 from ._controller import ConversionResult
+from ._charts import body_charts
+from ._comparison import body_comparison
+from ._exports import body_exports
+from ._metrics import create_debug_panel
+from ._metrics import is_debug_enabled
+from ._metrics import maybe_write_metrics
+from ._white_balance import body_white_balance
+
+
+TEMPERATURE_PRESETS = [
+    ("1700K", "Match flame, low pressure sodium lamps."),
+    ("1850K", "Candle flame, sunset/sunrise "),
+    ("2400K", "Standard incandescent lamps  "),
+    ("2550K", "Soft white incandescent lamps "),
+    ("2700K", "'Soft white' compact fluorescent and LED lamps "),
+    ("3000K", "Warm white compact fluorescent and LED lamps  "),
+    (
+        "5000K",
+        "Horizon daylight, cool white/daylight compact fluorescent lamps (CFL)",
+    ),
+    ("5900K", "Sunlight above the atmosphere (Space)"),
+    ("6500K", "Daylight, overcast"),
+    ("6500-9500K", "LCD or CRT screen "),
+    ("10637K (Planckian)", "Bluest sky in the world.(Brazil) --[2]"),
+    ("15,000-27,000K", "Clear blue poleward sky "),
+]
+
+PLOT_POLL_INTERVAL = 0.25
+"""
+Seconds between two checks for a finished background render of the plot, while
+one is pending.
+"""
+
+PLOT_SETTLE_DELAY = 0.2
+"""
+Seconds the conversion must stay unchanged before its plot is rendered, so
+dragging a slider only renders the plot where it stops.
+"""
+
+_ACTIVE_TIMER: contextvars.ContextVar[Optional[StageTimer]] = contextvars.ContextVar(
+    "_ACTIVE_TIMER", default=None
+)
+
+
+@contextlib.contextmanager
+def _fragment_stage(name: str) -> Iterator[StageTimer]:
+    """
+    Time a fragment as a stage of the full rerun it is part of, or as its own
+    rerun when it reruns alone.
+    """
+    timer = _ACTIVE_TIMER.get()
+    if timer is not None:
+        with timer.stage(name):
+            yield timer
+        return
+
+    timer = StageTimer(metrics=METRICS)
+    token = _ACTIVE_TIMER.set(timer)
+    try:
+        with timer.stage(name):
+            yield timer
+    finally:
+        _ACTIVE_TIMER.reset(token)
+    maybe_write_metrics()
 
 
 @widgetify
@@ -146,47 +215,160 @@ def body_display(result: ConversionResult):
         )
 
     streamlit.caption("sRGB preview with 2.2 power function")
+    # tiny flat image (same ratio as 1000x190) that is scaled up by the browser
     streamlit.image(
-        image=result.get_preview_image(1000, 190),
+        image=result.get_preview_png(100, 19),
         caption="",  # "sRGB preview with 2.2 power function",
-        clamp=True,
+        width="stretch",
     )
+    formatted = result.get_formatted(config().USER_NDECIMALS)
     column1, column2, column3 = streamlit.columns(3)
 
     with column1:
-        streamlit.code(
-            rgb_array_to_tuple(result.get_rgb_array(), config().USER_NDECIMALS),
-            language="text",
-        )
+        streamlit.code(formatted.rgb_tuple, language="text")
         streamlit.caption("⬆ RGB tuple style")
 
     with column2:
-        streamlit.code(
-            rgb_array_to_single_line(result.get_rgb_array(), config().USER_NDECIMALS),
-            language="text",
-        )
+        streamlit.code(formatted.rgb_single_line, language="text")
         streamlit.caption("⬆ RGBA Katana style")
 
     with column3:
-        streamlit.code(
-            xy_array_to_tuple(result.get_xy_array(), config().USER_NDECIMALS),
-            language="text",
-        )
+        streamlit.code(formatted.xy_tuple, language="text")
         streamlit.caption("⬆ CIE xy chromaticity coordinates")
 
     with streamlit.expander("As Nuke Node"):
-        streamlit.code(
-            rgb_array_to_nuke(
-                result.get_rgb_array(),
-                config().USER_NDECIMALS,
-                node_name=result.get_nuke_node_name(),
-                node_label=result.get_nuke_node_label(),
-            ),
-            language="text",
+        streamlit.code(formatted.nuke, language="text")
+
+
+def _update_plot(result: ConversionResult) -> bool:
+    """
+    Keep the finished render of the plot, or the one cached by any session, and
+    start the render of the conversion once it settled.
+
+    A session renders a single conversion at a time: when the user already moved
+    away from the conversion being rendered, the queued render is cancelled and
+    only the latest conversion is rendered next.
+
+    Returns:
+        True if the plot shown is the one of the conversion.
+    """
+    state = streamlit.session_state
+    key: ConversionKey = result.get_key()._replace(normalize=None)
+    shown = state.get("__PLOT_SHOWN")
+    task = state.get("__PLOT_TASK")
+
+    if task is not None and task[1].done():
+        del state["__PLOT_TASK"]
+        # even if outdated it is closer to the current conversion
+        if shown is None or shown[0] != key:
+            shown = (task[0], task[1].result())
+            state["__PLOT_SHOWN"] = shown
+        task = None
+
+    if shown is not None and shown[0] == key:
+        return True
+
+    # a render already started is left to finish, the latest conversion is
+    # submitted after it so a session never renders more than one at once.
+    if task is not None and task[0] != key and task[1].cancel():
+        del state["__PLOT_TASK"]
+        task = None
+
+    # already rendered by this or another session
+    cached = result.get_cached_cct_plot_png()
+    if cached is not None:
+        state["__PLOT_SHOWN"] = (key, cached)
+        return True
+
+    changed = state.get("__PLOT_CHANGED")
+    if changed is None or changed[0] != key:
+        changed = (key, time.monotonic())
+        state["__PLOT_CHANGED"] = changed
+
+    settled = time.monotonic() - changed[1] >= PLOT_SETTLE_DELAY
+    if task is None and (shown is None or settled):
+        state["__PLOT_TASK"] = (key, result.submit_cct_plot_png())
+    return False
+
+
+@streamlit.fragment
+def body_plot():
+    """
+    Chromaticity diagram of the conversion, rendered in the background so the
+    rest of the page doesn't wait for it. The previous diagram, or a placeholder,
+    is shown until the render is done.
+
+    The interactive mode is rendered by the browser instead, it is cheap enough to
+    follow every change.
+    """
+    with _fragment_stage("plot_refresh") as timer:
+        result = ConversionResult.from_active_context(timer=timer)
+        interactive = streamlit.toggle(
+            "Interactive diagram",
+            key="widget_plot_interactive",
+            help="Rendered by your browser, with zoom and pan.",
         )
+        if interactive:
+            streamlit.vega_lite_chart(result.get_cct_plot_spec(), width="stretch")
+            return
+
+        if not _update_plot(result):
+            body_plot_pending()
+            return
+
+        streamlit.image(streamlit.session_state["__PLOT_SHOWN"][1], width="stretch")
+
+
+@streamlit.fragment(run_every=PLOT_POLL_INTERVAL)
+def body_plot_pending():
+    """
+    Previous diagram, or a placeholder, shown until the plot of the conversion is
+    rendered, polling for it.
+
+    Only rendered while the plot is outdated: the full rerun that shows the
+    render drops it, which stops the polling.
+    """
+    with _fragment_stage("plot_poll") as timer:
+        result = ConversionResult.from_active_context(timer=timer)
+        if _update_plot(result):
+            streamlit.rerun()
+
+        shown = streamlit.session_state.get("__PLOT_SHOWN")
+        if shown is None:
+            streamlit.caption("Rendering the diagram ...")
+            return
+
+        streamlit.image(shown[1], width="stretch")
+        streamlit.caption("Updating the diagram ...")
+
 
-    figure, axes = result.get_cct_plot()
-    streamlit.pyplot(figure)
+@streamlit.fragment(key="conversion")
+def body_conversion():
+    """
+    Every section depending on the temperature and tint, rerun alone when their
+    widgets change so the sidebar and footer are left untouched.
+
+    The sections in expanders are only computed while their expander is open, so a
+    slider tick only reruns the header, the result and the plot by default.
+    """
+    with _fragment_stage("conversion") as timer:
+        with timer.stage("header"):
+            body_header()
+        with timer.stage("display"):
+            result = ConversionResult.from_active_context(timer=timer)
+            body_display(result=result)
+        body_plot()
+        with timer.stage("white_balance"):
+            body_white_balance(result=result)
+        with timer.stage("charts"):
+            body_charts(result=result)
+        with timer.stage("exports"):
+            body_exports(result=result)
+        with timer.stage("comparison"):
+            body_comparison(result=result)
+
+    if is_debug_enabled():
+        create_debug_panel(timer)
 
 
 def body_footer():
@@ -210,26 +392,8 @@ def body_footer():
     """
     )
 
-    table_data = [
-        ("1700K", "Match flame, low pressure sodium lamps."),
-        ("1850K", "Candle flame, sunset/sunrise "),
-        ("2400K", "Standard incandescent lamps  "),
-        ("2550K", "Soft white incandescent lamps "),
-        ("2700K", "'Soft white' compact fluorescent and LED lamps "),
-        ("3000K", "Warm white compact fluorescent and LED lamps  "),
-        (
-            "5000K",
-            "Horizon daylight, cool white/daylight compact fluorescent lamps (CFL)",
-        ),
-        ("5900K", "Sunlight above the atmosphere (Space)"),
-        ("6500K", "Daylight, overcast"),
-        ("6500-9500K", "LCD or CRT screen "),
-        ("10637K (Planckian)", "Bluest sky in the world.(Brazil) --[2]"),
-        ("15,000-27,000K", "Clear blue poleward sky "),
-    ]
-
     streamlit.markdown(
-        python_to_markdown_table(table_data, ["Temperature", "Description"])
+        python_to_markdown_table(TEMPERATURE_PRESETS, ["Temperature", "Description"])
     )
     streamlit.caption("-- [1]")
     streamlit.header("References")
@@ -254,10 +418,17 @@ def body_footer():
 
 
 def create_main_interface():
-    with streamlit.sidebar:
-        create_sidebar()
-    streamlit.title("Temperature to RGB color.".upper())
-    body_header()
-    result = ConversionResult.from_active_context()
-    body_display(result=result)
-    body_footer()
+    timer = StageTimer(metrics=METRICS)
+    token = _ACTIVE_TIMER.set(timer)
+    try:
+        with timer.stage("rerun"):
+            with timer.stage("sidebar"), streamlit.sidebar:
+                create_sidebar()
+            streamlit.title("Temperature to RGB color.".upper())
+            body_conversion()
+            with timer.stage("footer"):
+                body_footer()
+    finally:
+        _ACTIVE_TIMER.reset(token)
+
+    maybe_write_metrics()
@@ -0,0 +1,241 @@
+import dataclasses
+import json
+import logging
+import os
+import sys
+import threading
+import time
+from pathlib import Path
+from typing import Optional
+
+import streamlit
+
+from streamlit_temperature2rgb._metrics import METRICS
+from streamlit_temperature2rgb._metrics import StageTimer
+from streamlit_temperature2rgb._metrics import get_memory_usage
+from streamlit_temperature2rgb._metrics import stage_metrics_to_prometheus
+from streamlit_temperature2rgb._metrics import to_prometheus_metric
+from ._controller import CONVERSION_CACHE
+from ._controller import PLOT_CACHE
+from ._controller import PREVIEW_CACHE
+
+LOGGER = logging.getLogger(__name__)
+
+DEBUG_ENV_VAR = "TEMPERATURE2RGB_DEBUG"
+"""
+Set this environment variable to 1 to always show the debug panel in the sidebar.
+It can also be shown per session by adding ``?debug=1`` to the app url.
+"""
+
+METRICS_ENV_VAR = "TEMPERATURE2RGB_METRICS_FILE"
+"""
+Path of a file to periodically write the process metrics to. Written as JSON if
+the path ends with ``.json``, else in the Prometheus text format.
+"""
+
+METRICS_WRITE_INTERVAL = 10.0
+"""
+Minimal number of seconds between two writes of the metrics file.
+"""
+
+_PROCESS_METRICS = {
+    "rss": "Resident memory of the process in bytes.",
+    "peak_rss": "Peak resident memory of the process in bytes.",
+    "figures": "Matplotlib figures created for the plots still in memory.",
+    "pyplot_figures": "Matplotlib figures registered in pyplot.",
+}
+
+_LAST_WRITE = 0.0
+_WRITE_LOCK = threading.Lock()
+
+
+def _get_caches():
+    return {
+        "conversion": CONVERSION_CACHE,
+        "preview": PREVIEW_CACHE,
+        "plot": PLOT_CACHE,
+    }
+
+
+def _get_process_metrics() -> dict[str, int]:
+    process = get_memory_usage()
+    # matplotlib is slow to import, only report figures when it was used
+    plot_module = sys.modules.get("streamlit_temperature2rgb.core._plot")
+    if plot_module is not None:
+        process.update(plot_module.get_figure_count())
+    return process
+
+
+def get_metrics() -> dict:
+    """
+    Returns:
+        process-wide stage durations, cache statistics, boot timings, memory usage
+        and number of live matplotlib figures.
+    """
+    # the warmup imports the interface, which imports this module
+    from ._warmup import get_boot_timings
+
+    return {
+        "stages": METRICS.snapshot(),
+        "caches": {
+            name: dataclasses.asdict(cache.stats())
+            for name, cache in _get_caches().items()
+        },
+        "boot": get_boot_timings(),
+        "process": _get_process_metrics(),
+    }
+
+
+def export_metrics(format: str = "prometheus") -> str:
+    """
+    Args:
+        format: "prometheus" for the Prometheus text exposition format or "json".
+    """
+    metrics = get_metrics()
+    if format == "json":
+        return json.dumps(metrics, indent=4)
+    if format != "prometheus":
+        raise ValueError(f"Unsupported metrics format {format!r}")
+
+    caches = metrics["caches"]
+    process = metrics["process"]
+    return (
+        stage_metrics_to_prometheus(metrics["stages"])
+        + to_prometheus_metric(
+            "temperature2rgb_cache_requests_total",
+            "counter",
+            "Requests to the process-wide caches.",
+            [
+                ({"cache": name, "result": result}, stats[field])
+                for name, stats in caches.items()
+                for result, field in (("hit", "hits"), ("miss", "misses"))
+            ],
+        )
+        + to_prometheus_metric(
+            "temperature2rgb_cache_evictions_total",
+            "counter",
+            "Entries evicted from the process-wide caches.",
+            [({"cache": name}, stats["evictions"]) for name, stats in caches.items()],
+        )
+        + to_prometheus_metric(
+            "temperature2rgb_cache_entries",
+            "gauge",
+            "Number of entries in the process-wide caches.",
+            [({"cache": name}, stats["size"]) for name, stats in caches.items()],
+        )
+        + to_prometheus_metric(
+            "temperature2rgb_boot_seconds",
+            "gauge",
+            "Duration of the process boot steps.",
+            [({"step": name}, value) for name, value in metrics["boot"].items()],
+        )
+        + "".join(
+            to_prometheus_metric(
+                f"temperature2rgb_process_{name}",
+                "gauge",
+                description,
+                [({}, process[name])],
+            )
+            for name, description in _PROCESS_METRICS.items()
+            if name in process
+        )
+    )
+
+
+def write_metrics(path: Path):
+    """
+    Write the metrics to the given file, replacing it atomically.
+    """
+    format = "json" if path.suffix == ".json" else "prometheus"
+    content = export_metrics(format)
+    tmp_path = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+    tmp_path.write_text(content, encoding="utf-8")
+    os.replace(tmp_path, path)
+
+
+def maybe_write_metrics(force: bool = False) -> Optional[Path]:
+    """
+    Write the metrics file configured with the environment variable, if its
+    last write is older than ``METRICS_WRITE_INTERVAL``.
+
+    Returns:
+        path of the file if it was written.
+    """
+    global _LAST_WRITE
+
+    path = os.environ.get(METRICS_ENV_VAR)
+    if not path:
+        return None
+
+    with _WRITE_LOCK:
+        now = time.monotonic()
+        if not force and now - _LAST_WRITE < METRICS_WRITE_INTERVAL:
+            return None
+        _LAST_WRITE = now
+
+    path = Path(path)
+    try:
+        write_metrics(path)
+    except OSError:
+        LOGGER.exception(f"cannot write metrics to {path}")
+        return None
+    return path
+
+
+def is_debug_enabled() -> bool:
+    if os.environ.get(DEBUG_ENV_VAR) == "1":
+        return True
+    return streamlit.query_params.get("debug") == "1"
+
+
+def create_debug_panel(timer: StageTimer):
+    """
+    Show the stages of the current rerun and the process metrics in the sidebar.
+    """
+    expander = streamlit.sidebar.expander(
+        "Debug", key="widget_debug_expanded", on_change="rerun"
+    )
+    with expander:
+        if not expander.open:
+            return
+
+        streamlit.caption("This rerun")
+        records = timer.get_records()
+        cached_labels = {None: "", True: "hit", False: "miss"}
+        streamlit.dataframe(
+            {
+                "stage": [record.name for record in records],
+                "ms": [record.duration * 1000 for record in records],
+                "cache": [cached_labels[record.cached] for record in records],
+            },
+            hide_index=True,
+        )
+
+        streamlit.caption("Process")
+        metrics = get_metrics()
+        stages = metrics["stages"]
+        streamlit.dataframe(
+            {
+                "stage": list(stages),
+                "count": [stats["count"] for stats in stages.values()],
+                "p50 ms": [stats["p50"] * 1000 for stats in stages.values()],
+                "p95 ms": [stats["p95"] * 1000 for stats in stages.values()],
+                "p99 ms": [stats["p99"] * 1000 for stats in stages.values()],
+                "hits": [stats["hits"] for stats in stages.values()],
+                "misses": [stats["misses"] for stats in stages.values()],
+            },
+            hide_index=True,
+        )
+        streamlit.json(
+            {
+                "caches": metrics["caches"],
+                "boot": metrics["boot"],
+                "process": metrics["process"],
+            }
+        )
+        streamlit.download_button(
+            "Download metrics",
+            data=export_metrics("prometheus"),
+            file_name="temperature2rgb_metrics.txt",
+            mime="text/plain",
+        )
@@ -0,0 +1,160 @@
+import contextlib
+import logging
+import os
+import re
+import threading
+import time
+from typing import Optional
+
+import colour
+
+from ._config import ChromaticAdaptationTransforms
+from ._config import Colorspaces
+from ._config import DEFAULT_CONFIG
+from ._config import Illuminants
+from ._controller import ConversionResult
+from ._controller import UI_PLANCKIAN_BACKEND
+from ._main import TEMPERATURE_PRESETS
+
+LOGGER = logging.getLogger(__name__)
+
+WARMUP_ENV_VAR = "TEMPERATURE2RGB_WARMUP"
+"""
+Set this environment variable to 1 to precompute common results when the app boots.
+"""
+
+_BOOT_TIMINGS: dict[str, float] = {}
+_BOOT_TIMINGS_LOCK = threading.Lock()
+
+_WARMUP_THREAD: Optional[threading.Thread] = None
+_WARMUP_LOCK = threading.Lock()
+
+
+def record_boot_timing(name: str, duration: float):
+    """
+    Store how long a boot step took, in seconds.
+
+    Only the first duration recorded for a name is kept, so this can be called on
+    every rerun to only report the first one of the process.
+    """
+    with _BOOT_TIMINGS_LOCK:
+        if name in _BOOT_TIMINGS:
+            return
+        _BOOT_TIMINGS[name] = duration
+    LOGGER.info(f"boot timing {name}: {duration * 1000:.1f}ms")
+
+
+def get_boot_timings() -> dict[str, float]:
+    """
+    Returns:
+        mapping of boot step name to its duration in seconds.
+    """
+    with _BOOT_TIMINGS_LOCK:
+        return dict(_BOOT_TIMINGS)
+
+
+@contextlib.contextmanager
+def _timed(name: str):
+    start = time.perf_counter()
+    yield
+    record_boot_timing(name, time.perf_counter() - start)
+
+
+def get_preset_temperatures() -> list[float]:
+    """
+    Extract the temperatures mentioned in the presets table.
+    """
+    temperatures = []
+    for label, _ in TEMPERATURE_PRESETS:
+        label = label.replace(",", "")
+        temperatures += [float(match) for match in re.findall(r"\d+", label)]
+    return temperatures
+
+
+def _create_result(
+    temperature: float,
+    colorspace: Colorspaces,
+    use_daylight: bool = False,
+) -> ConversionResult:
+    return ConversionResult(
+        temperature,
+        colorspace,
+        DEFAULT_CONFIG["USER_ILLUMINANT_NAME"],
+        DEFAULT_CONFIG["USER_CAT_NAME"],
+        DEFAULT_CONFIG["USER_TINT"],
+        use_daylight,
+        DEFAULT_CONFIG["USER_NORMALIZE"],
+        backend=UI_PLANCKIAN_BACKEND,
+    )
+
+
+def warmup():
+    """
+    Precompute the results most users will request, to fill the process caches.
+    """
+    from streamlit_temperature2rgb.core import get_cct_plot_background
+    from streamlit_temperature2rgb.core import get_XYZ_to_RGB_matrix
+    from streamlit_temperature2rgb.core import get_whitepoint
+
+    with _timed("warmup.default_conversion"):
+        result = _create_result(
+            DEFAULT_CONFIG["USER_TEMPERATURE"],
+            DEFAULT_CONFIG["USER_COLORSPACE_NAME"],
+            use_daylight=DEFAULT_CONFIG["USER_DAYLIGHT_MODE"],
+        )
+        result.get_preview_png(100, 19)
+        # also pay for matplotlib font caching and the default plot background
+        result.get_cct_plot_png()
+
+    with _timed("warmup.plot_backgrounds"):
+        for colorspace in Colorspaces:
+            get_cct_plot_background(colorspace.as_core())
+
+    with _timed("warmup.matrices"):
+        for colorspace in Colorspaces:
+            rgb_colorspace = colour.RGB_COLOURSPACES[colorspace.as_core()]
+            for illuminant in Illuminants:
+                whitepoint = get_whitepoint(illuminant.as_core(), rgb_colorspace)
+                for cat in ChromaticAdaptationTransforms:
+                    get_XYZ_to_RGB_matrix(rgb_colorspace, whitepoint, cat.as_core())
+
+    with _timed("warmup.presets"):
+        for temperature in get_preset_temperatures():
+            for colorspace in Colorspaces:
+                _create_result(temperature, colorspace).get_preview_png(100, 19)
+                if temperature >= 1667:
+                    result = _create_result(temperature, colorspace, use_daylight=True)
+                    result.get_preview_png(100, 19)
+
+
+def start_warmup(force: bool = False) -> Optional[threading.Thread]:
+    """
+    Run ``warmup`` in a background thread, once per process.
+
+    Does nothing unless the ``TEMPERATURE2RGB_WARMUP`` environment variable is
+    set to 1, or ``force`` is True.
+
+    Returns:
+        the warmup thread if it was started by this call.
+    """
+    global _WARMUP_THREAD
+
+    if not force and os.environ.get(WARMUP_ENV_VAR) != "1":
+        return None
+
+    with _WARMUP_LOCK:
+        if _WARMUP_THREAD is not None:
+            return None
+
+        def _run():
+            try:
+                with _timed("warmup"):
+                    warmup()
+            except Exception:
+                LOGGER.exception("warmup failed")
+
+        _WARMUP_THREAD = threading.Thread(
+            target=_run, name="temperature2rgb-warmup", daemon=True
+        )
+        _WARMUP_THREAD.start()
+        return _WARMUP_THREAD
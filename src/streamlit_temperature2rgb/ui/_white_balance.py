@@ -0,0 +1,167 @@
+import io
+
+import numpy
+import PIL.Image
+import streamlit
+
+from streamlit_temperature2rgb.core import apply_white_balance
+from streamlit_temperature2rgb.core import write_png16
+from ._config import stage_cache
+from ._controller import ConversionResult
+
+PREVIEW_WIDTH = 800
+
+WHITE_BALANCE_MODES = {
+    "Neutralize the light color": False,
+    "Apply the light color": True,
+}
+
+
+SWAPPED_RAWMODES = {
+    "RGB;16B": "RGB;16L",
+    "RGB;16L": "RGB;16B",
+    "RGBA;16B": "RGBA;16L",
+    "RGBA;16L": "RGBA;16B",
+}
+"""
+Pillow has no 16-bit rgb mode and unpacks the high byte of each sample of these
+raw modes, unpacking them with the opposite byte order gives the low byte.
+"""
+
+
+def _get_rawmode(image: PIL.Image.Image) -> str | None:
+    if not image.tile:
+        return None
+    args = image.tile[0].args
+    return args if isinstance(args, str) else args[0] if args else None
+
+
+def _read_16bit(data: bytes, rawmode: str) -> numpy.ndarray:
+    high = numpy.asarray(PIL.Image.open(io.BytesIO(data)), dtype=numpy.uint16)
+    image = PIL.Image.open(io.BytesIO(data))
+    swapped = SWAPPED_RAWMODES[rawmode]
+    image.tile = [
+        tile._replace(
+            args=swapped if isinstance(tile.args, str) else (swapped, *tile.args[1:])
+        )
+        for tile in image.tile
+    ]
+    low = numpy.asarray(image, dtype=numpy.uint16)
+    return (high << 8 | low).astype(numpy.float32) / 65535
+
+
+def _read_image(data: bytes, is_npy: bool) -> numpy.ndarray:
+    if is_npy:
+        array = numpy.load(io.BytesIO(data), allow_pickle=False)
+        if not numpy.issubdtype(array.dtype, numpy.floating):
+            array = array.astype(numpy.float32)
+        return array
+
+    image = PIL.Image.open(io.BytesIO(data))
+    if image.mode == "F":
+        # float images are linear, like .npy arrays
+        array = numpy.asarray(image, dtype=numpy.float32)
+        return numpy.repeat(array[..., None], 3, axis=-1)
+
+    rawmode = _get_rawmode(image)
+    if rawmode in SWAPPED_RAWMODES:
+        array = _read_16bit(data, rawmode)
+    elif image.mode.startswith("I;16") or image.mode == "I":
+        # older Pillow versions open 16-bit grayscale PNGs as "I"
+        array = numpy.asarray(image, dtype=numpy.float32) / 65535
+        array = numpy.repeat(array[..., None], 3, axis=-1)
+    else:
+        image = image.convert("RGBA" if "A" in image.getbands() else "RGB")
+        array = numpy.asarray(image, dtype=numpy.float32) / 255
+    # same 2.2 power function as the preview
+    array[..., :3] **= 2.2
+    return array
+
+
+def _to_8bit(array: numpy.ndarray) -> numpy.ndarray:
+    array = numpy.clip(array, 0.0, 1.0)
+    array[..., :3] **= 1 / 2.2
+    return (array * 255 + 0.5).astype(numpy.uint8)
+
+
+def _to_preview(array: numpy.ndarray) -> numpy.ndarray:
+    step = max(1, -(-array.shape[1] // PREVIEW_WIDTH))
+    return _to_8bit(array[::step, ::step])
+
+
+def _encode(array: numpy.ndarray, is_npy: bool) -> bytes:
+    buffer = io.BytesIO()
+    if is_npy:
+        numpy.save(buffer, array, allow_pickle=False)
+    else:
+        write_png16(array, buffer)
+    return buffer.getvalue()
+
+
+def _process(uploaded, result: ConversionResult, invert: bool):
+    is_npy = uploaded.name.lower().endswith(".npy")
+    image = _read_image(uploaded.getvalue(), is_npy)
+    if image.ndim != 3 or image.shape[-1] < 3:
+        raise ValueError(f"Expected an rgb image, got an array of shape {image.shape}")
+
+    before = _to_preview(image)
+    # the decoded image is only used here, so reuse its memory for the output
+    apply_white_balance(image, result.get_white_balance_matrix(invert), out=image)
+    return before, _to_preview(image), _encode(image, is_npy)
+
+
+def body_white_balance(result: ConversionResult):
+    expander = streamlit.expander(
+        "White balance an image",
+        key="widget_white_balance_expanded",
+        on_change="rerun",
+    )
+    with expander:
+        if not expander.open:
+            return
+
+        streamlit.caption(
+            "Adapt an image so the chosen temperature becomes neutral, or the "
+            "opposite. 8 and 16-bit PNG, JPEG and TIFF are decoded with a 2.2 power "
+            "function, float TIFF and `.npy` arrays are expected linear, all in the "
+            "target colorspace. Images are downloaded as 16-bit PNG."
+        )
+        uploaded = streamlit.file_uploader(
+            "Image",
+            type=["png", "jpg", "jpeg", "tif", "tiff", "npy"],
+            key="widget_white_balance_file",
+        )
+        mode = streamlit.radio(
+            "Mode",
+            options=list(WHITE_BALANCE_MODES),
+            horizontal=True,
+            key="widget_white_balance_mode",
+        )
+        if uploaded is None:
+            return
+
+        invert = WHITE_BALANCE_MODES[mode]
+        try:
+            before, after, data = stage_cache().get(
+                "white_balance",
+                (uploaded.file_id, result.get_key(), invert),
+                lambda: _process(uploaded, result, invert),
+            )
+        except (ValueError, OSError) as error:
+            streamlit.error(f"Cannot process {uploaded.name}: {error}")
+            return
+
+        column1, column2 = streamlit.columns(2)
+        with column1:
+            streamlit.image(before, caption="Before", width="stretch")
+        with column2:
+            streamlit.image(after, caption="After", width="stretch")
+
+        stem = uploaded.name.rsplit(".", 1)[0]
+        extension = "npy" if uploaded.name.lower().endswith(".npy") else "png"
+        streamlit.download_button(
+            "Download",
+            data=data,
+            file_name=f"{stem}_white_balanced.{extension}",
+            mime="application/octet-stream" if extension == "npy" else "image/png",
+        )
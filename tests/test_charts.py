@@ -0,0 +1,39 @@
+import colour
+import numpy
+
+from streamlit_temperature2rgb.core import convert_cct_batch
+from streamlit_temperature2rgb.core import create_cct_tint_chart
+from streamlit_temperature2rgb.core import _charts
+
+COLOURSPACE = colour.RGB_COLOURSPACES["sRGB"]
+
+
+def test_cct_tint_chart_chunks(monkeypatch):
+    monkeypatch.setattr(_charts, "CHART_PIXELS_PER_CHUNK", 30)
+    image = create_cct_tint_chart(
+        1000.0,
+        10000.0,
+        -150.0,
+        150.0,
+        16,
+        7,
+        COLOURSPACE,
+        COLOURSPACE.whitepoint,
+        "Bradford",
+    )
+
+    CCT, D_uv = numpy.meshgrid(
+        numpy.linspace(1000.0, 10000.0, 16), numpy.linspace(150.0, -150.0, 7)
+    )
+    expected = convert_cct_batch(
+        CCT,
+        colorspace=COLOURSPACE,
+        illuminant=COLOURSPACE.whitepoint,
+        cat="Bradford",
+        tint=D_uv,
+        locus="Planckian",
+        normalize=True,
+    ).rgb.reshape(7, 16, 3)
+
+    assert image.shape == (7, 16, 3)
+    numpy.testing.assert_array_equal(image, expected)
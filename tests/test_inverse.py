@@ -0,0 +1,70 @@
+import colour
+import numpy
+import pytest
+
+from streamlit_temperature2rgb.core import PlanckianCCTConversion
+from streamlit_temperature2rgb.core import get_planckian_lut
+from streamlit_temperature2rgb.core import xy_to_cct_batch
+
+COLOURSPACE = colour.RGB_COLOURSPACES["sRGB"]
+
+
+def _round_trip(CCT, D_uv):
+    CCT, D_uv = (array.ravel() for array in numpy.meshgrid(CCT, D_uv))
+    xy = PlanckianCCTConversion(
+        CCT, COLOURSPACE, COLOURSPACE.whitepoint, "Bradford", D_uv
+    ).xy
+    result = xy_to_cct_batch(xy)
+    return CCT, D_uv, result
+
+
+@pytest.mark.parametrize("temperature", [798.0, 20000.0])
+def test_planckian_round_trip_on_table_bounds(temperature):
+    CCT, D_uv, result = _round_trip([temperature], numpy.linspace(-0.05, 0.05, 201))
+
+    assert not numpy.isnan(result.CCT).any()
+    assert numpy.max(numpy.abs(result.CCT - CCT) / CCT) < 5e-7
+    assert numpy.max(numpy.abs(result.D_uv - D_uv)) < 4e-9
+
+
+def test_planckian_table_projects_its_domain():
+    CCT, D_uv = (
+        array.ravel()
+        for array in numpy.meshgrid(
+            1e6 / numpy.linspace(50, 1e6 / 798, 301), numpy.linspace(-0.05, 0.05, 11)
+        )
+    )
+    uv = get_planckian_lut().uv(CCT, D_uv)
+
+    assert not numpy.isnan(get_planckian_lut().project(uv)).any()
+
+
+def test_planckian_round_trip_across_domain():
+    CCT, D_uv, result = _round_trip(
+        1e6 / numpy.linspace(50, 1e6 / 798, 301), numpy.linspace(-0.05, 0.05, 11)
+    )
+
+    assert numpy.max(numpy.abs(result.CCT - CCT) / CCT) < 5e-7
+    assert numpy.max(numpy.abs(result.D_uv - D_uv)) < 4e-9
+
+
+@pytest.mark.parametrize("temperature", [500.0, 700.0, 790.0])
+def test_planckian_below_table_is_nan(temperature):
+    _, _, result = _round_trip([temperature], numpy.linspace(-0.05, 0.05, 5))
+
+    assert numpy.isnan(result.CCT).all()
+    assert numpy.isnan(result.D_uv).all()
+
+
+def test_planckian_above_table():
+    CCT, D_uv, result = _round_trip([25000.0, 50000.0], [-0.02, 0.0, 0.02])
+    assert numpy.max(numpy.abs(result.CCT - CCT) / CCT) < 1e-5
+    assert numpy.max(numpy.abs(result.D_uv - D_uv)) < 5e-7
+
+    _, _, result = _round_trip([150000.0], [0.0])
+    assert numpy.isnan(result.CCT).all()
+
+
+def test_blackbody_is_not_supported():
+    with pytest.raises(ValueError, match="Blackbody"):
+        xy_to_cct_batch([[0.3127, 0.329]], locus="Blackbody")
@@ -0,0 +1,13 @@
+import colour
+
+from streamlit_temperature2rgb.core import get_XYZ_to_RGB_matrix
+
+
+def test_unadapted_matrix_does_not_freeze_the_colorspace():
+    colorspace = colour.RGB_COLOURSPACES["Adobe RGB (1998)"]
+
+    matrix = get_XYZ_to_RGB_matrix(colorspace, colorspace.whitepoint, None)
+
+    assert not matrix.flags.writeable
+    assert colorspace.matrix_XYZ_to_RGB.flags.writeable
+    assert matrix is not colorspace.matrix_XYZ_to_RGB
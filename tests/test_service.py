@@ -0,0 +1,244 @@
+import asyncio
+import json
+import urllib.parse
+from typing import Optional
+
+import numpy
+import pytest
+
+from streamlit_temperature2rgb.service import ConversionService
+from streamlit_temperature2rgb.service._server import Request
+from streamlit_temperature2rgb.service import start_server
+
+TIMEOUT = 30.0
+"""
+Seconds to wait for the server, so a broken test fails instead of hanging.
+"""
+
+
+@pytest.fixture
+def service():
+    service = ConversionService(max_workers=2)
+    yield service
+    service.shutdown()
+
+
+async def _read_response(reader: asyncio.StreamReader) -> tuple[int, dict, bytes]:
+    status_line = await reader.readline()
+    headers = {}
+    while (line := await reader.readline()) not in (b"\r\n", b""):
+        name, _, value = line.decode("latin-1").partition(":")
+        headers[name.strip().lower()] = value.strip()
+    body = await reader.readexactly(int(headers["content-length"]))
+    return int(status_line.split()[1]), headers, body
+
+
+def _exchange(
+    service: ConversionService, raw: bytes
+) -> tuple[int, dict, bytes, Optional[bytes]]:
+    """
+    Send raw bytes to a server and read the response.
+
+    Returns:
+        status, headers and body of the response, then what the server sent next
+        if it closed the connection, else None.
+    """
+
+    async def _run():
+        server = await start_server(port=0, service=service)
+        host, port = server.sockets[0].getsockname()[:2]
+        reader, writer = await asyncio.open_connection(host, port)
+        try:
+            writer.write(raw)
+            status, headers, body = await asyncio.wait_for(
+                _read_response(reader), timeout=TIMEOUT
+            )
+            if headers.get("connection") == "close":
+                remaining = await asyncio.wait_for(reader.read(), timeout=TIMEOUT)
+            else:
+                remaining = None
+        finally:
+            writer.close()
+            server.close()
+            await server.wait_closed()
+        return status, headers, body, remaining
+
+    return asyncio.run(_run())
+
+
+def _post(path: str, body: bytes, content_length: Optional[str] = None) -> bytes:
+    if content_length is None:
+        content_length = str(len(body))
+    return (
+        f"POST {path} HTTP/1.1\r\nHost: test\r\n"
+        f"Content-Length: {content_length}\r\n\r\n"
+    ).encode("latin-1") + body
+
+
+def test_convert_json(service):
+    body = json.dumps({"temperature": 6500}).encode()
+    status, headers, body, _ = _exchange(service, _post("/convert", body))
+
+    assert status == 200
+    assert headers["content-type"] == "application/json"
+    data = json.loads(body)
+    assert set(data) == {"temperature", "tint", "rgb", "xy", "XYZ"}
+    assert data["temperature"] == 6500
+    assert data["tint"] == 0
+    assert len(data["rgb"]) == 3
+    assert len(data["xy"]) == 2
+    assert len(data["XYZ"]) == 3
+
+
+@pytest.mark.parametrize("content_length", ["abc", "-5", "+5", "1_0", "²"])
+def test_invalid_content_length(service, content_length):
+    body = json.dumps({"temperature": 6500}).encode()
+    status, headers, body, remaining = _exchange(
+        service, _post("/convert", body, content_length=content_length)
+    )
+
+    assert status == 400
+    assert "content-length" in json.loads(body)["error"]
+    assert remaining == b""
+
+
+def test_oversized_content_length(service):
+    status, _, body, remaining = _exchange(
+        service, _post("/batch", b"", content_length=str(2**40))
+    )
+
+    assert status == 400
+    assert "larger" in json.loads(body)["error"]
+    assert remaining == b""
+
+
+def _request(method: str, target: str, body=None, binary=False) -> Request:
+    url = urllib.parse.urlsplit(target)
+    headers = {}
+    if binary:
+        headers["content-type"] = "application/octet-stream"
+        body = numpy.asarray(body, dtype="<f8").tobytes()
+    elif body is not None and not isinstance(body, bytes):
+        body = json.dumps(body).encode()
+    return Request(
+        method=method,
+        path=url.path,
+        query=dict(urllib.parse.parse_qsl(url.query)),
+        headers=headers,
+        body=body or b"",
+    )
+
+
+def _handle(service, request: Request):
+    response = asyncio.run(service.handle_request(request))
+    return response.status, json.loads(response.body)
+
+
+def test_batch_json(service):
+    status, data = _handle(
+        service,
+        _request(
+            "POST",
+            "/batch",
+            {"temperatures": [2000, 6500, 9000], "tints": [0, 10, -10]},
+        ),
+    )
+
+    assert status == 200
+    assert set(data) == {"rgb", "xy", "XYZ"}
+    assert numpy.shape(data["rgb"]) == (3, 3)
+    assert numpy.shape(data["xy"]) == (3, 2)
+    assert numpy.shape(data["XYZ"]) == (3, 3)
+
+
+@pytest.mark.parametrize(
+    "request_, message",
+    [
+        (_request("GET", "/convert"), "missing 'temperature'"),
+        (_request("GET", "/convert?temperature=abc"), "'temperature' must be numbers"),
+        (
+            _request("GET", "/convert?temperature=-6500"),
+            "'temperature' must be between",
+        ),
+        (_request("GET", "/convert?temperature=nan"), "'temperature' must be between"),
+        (
+            _request("GET", "/convert?temperature=1000&locus=Daylight"),
+            "'temperature' must be between 1667",
+        ),
+        (
+            _request("GET", "/convert?temperature=6500&tint=abc"),
+            "'tint' must be numbers",
+        ),
+        (
+            _request("GET", "/convert?temperature=6500&tint=200"),
+            "'tint' must be between",
+        ),
+        (_request("POST", "/convert", {"temperature": [6500, 7000]}), "single numbers"),
+        (_request("POST", "/convert", {"temperature": True}), "must be numbers"),
+        (_request("POST", "/batch", {"tints": [0]}), "missing 'temperatures'"),
+        (
+            _request("POST", "/batch", {"temperatures": [6500, "abc"]}),
+            "'temperatures' must be numbers",
+        ),
+        (
+            _request("POST", "/batch", {"temperatures": [6500, 0]}),
+            "'temperatures' must be between",
+        ),
+        (
+            _request(
+                "POST", "/batch", {"temperatures": [6500, 7000], "tints": [0] * 3}
+            ),
+            "got 3 tints for 2 temperatures",
+        ),
+        (
+            _request("POST", "/batch?tint=abc", [6500.0], binary=True),
+            "'tint' must be numbers",
+        ),
+        (
+            _request("POST", "/batch?tint=-151", [6500.0], binary=True),
+            "'tint' must be between",
+        ),
+        (
+            _request("POST", "/batch", [6500.0, -1.0], binary=True),
+            "'temperatures' must be between",
+        ),
+        (_request("POST", "/batch", b"{"), "invalid JSON body"),
+        (_request("GET", "/convert?temperature=6500&cat=abc"), "invalid cat"),
+    ],
+)
+def test_bad_request(service, request_, message):
+    status, data = _handle(service, request_)
+
+    assert status == 400
+    assert message in data["error"]
+
+
+def test_binary_batch(service):
+    request = _request(
+        "POST", "/batch?tint=10&output=xy", [2000.0, 6500.0], binary=True
+    )
+    request.headers["accept"] = "application/octet-stream"
+    response = asyncio.run(service.handle_request(request))
+
+    assert response.status == 200
+    assert response.headers["X-Array-Shape"] == "2,2"
+    xy = numpy.frombuffer(response.body, dtype="<f8").reshape(2, 2)
+    _, data = _handle(
+        service,
+        _request("POST", "/batch", {"temperatures": [2000, 6500], "tints": 10}),
+    )
+    numpy.testing.assert_array_equal(xy, data["xy"])
+
+
+def test_concurrent_requests_are_coalesced(service):
+    async def _run():
+        requests = [_request("GET", "/convert?temperature=4000") for _ in range(2)]
+        return await asyncio.gather(
+            *(service.handle_request(request) for request in requests)
+        )
+
+    responses = asyncio.run(_run())
+
+    assert service.coalesced_requests == 1
+    assert [response.status for response in responses] == [200, 200]
+    assert responses[0].body == responses[1].body
@@ -0,0 +1,49 @@
+import numpy
+import pytest
+
+from streamlit_temperature2rgb.core import rgb_array_to_nuke
+from streamlit_temperature2rgb.core import rgb_array_to_single_line
+from streamlit_temperature2rgb.core import rgb_array_to_tuple
+from streamlit_temperature2rgb.core import rgb_batch_to_nuke
+from streamlit_temperature2rgb.core import rgb_batch_to_single_line
+from streamlit_temperature2rgb.core import rgb_batch_to_tuple
+from streamlit_temperature2rgb.core import xy_array_to_tuple
+from streamlit_temperature2rgb.core import xy_batch_to_tuple
+
+
+def _values() -> numpy.ndarray:
+    random = numpy.random.default_rng(0)
+    values = random.uniform(-2.0, 2.0, (300, 3))
+    values[:30] = numpy.round(values[:30], 3) + 0.0005
+    values[30:60] *= 1e-5
+    values[60:90] *= 1e17
+    values[90] = [0.0, -0.0, 1.0]
+    values[91] = [numpy.nan, numpy.inf, -numpy.inf]
+    values[92] = [1234.5, 0.125, 99999.99]
+    return values
+
+
+@pytest.mark.parametrize("ndecimals", [-2, -1, 0, 1, 3, 5, 9, 12, 16])
+def test_batch_matches_single(ndecimals):
+    values = _values()
+
+    assert rgb_batch_to_single_line(values, ndecimals) == "\n".join(
+        rgb_array_to_single_line(row, ndecimals) for row in values
+    )
+    assert rgb_batch_to_tuple(values, ndecimals) == "\n".join(
+        rgb_array_to_tuple(row, ndecimals) for row in values
+    )
+    assert xy_batch_to_tuple(values[:, :2], ndecimals) == "\n".join(
+        xy_array_to_tuple(row, ndecimals) for row in values[:, :2]
+    )
+
+
+def test_nuke_batch_matches_single():
+    values = _values()[:20]
+    names = [f"node{index}" for index in range(len(values))]
+    labels = [f"label\n{index}" for index in range(len(values))]
+
+    assert rgb_batch_to_nuke(values, 5, names, labels) == "\n".join(
+        rgb_array_to_nuke(row, 5, name, label)
+        for row, name, label in zip(values, names, labels)
+    )
@@ -0,0 +1,50 @@
+import io
+
+import numpy
+import PIL.Image
+import pytest
+
+from streamlit_temperature2rgb.core import image_to_png16
+from streamlit_temperature2rgb.ui._white_balance import _read_image
+
+
+def _encode_16bit(image: numpy.ndarray) -> numpy.ndarray:
+    encoded = numpy.asarray(image, dtype=numpy.float64).copy()
+    encoded[..., :3] **= 1 / 2.2
+    return (encoded * 65535 + 0.5).astype(numpy.uint16) / 65535
+
+
+@pytest.mark.parametrize("channels", [3, 4])
+def test_read_16bit_png(channels):
+    image = numpy.random.default_rng(0).random((17, 23, channels))
+
+    array = _read_image(image_to_png16(image), is_npy=False)
+
+    expected = _encode_16bit(image)
+    expected[..., :3] **= 2.2
+    assert array.shape == image.shape
+    numpy.testing.assert_allclose(array, expected, atol=1e-6)
+    # finer than the 8-bit steps
+    assert numpy.max(numpy.abs(array - image)) < 1e-4
+
+
+def test_read_16bit_grayscale_png():
+    values = numpy.linspace(0, 65535, 80).astype(numpy.uint16).reshape(4, 20)
+    buffer = io.BytesIO()
+    PIL.Image.fromarray(values).save(buffer, format="PNG")
+
+    array = _read_image(buffer.getvalue(), is_npy=False)
+
+    assert array.shape == (*values.shape, 3)
+    numpy.testing.assert_allclose(array[..., 1], (values / 65535) ** 2.2, rtol=1e-5)
+
+
+def test_read_float_tiff():
+    values = numpy.linspace(0.0, 4.0, 60, dtype=numpy.float32).reshape(6, 10)
+    buffer = io.BytesIO()
+    PIL.Image.fromarray(values).save(buffer, format="TIFF")
+
+    array = _read_image(buffer.getvalue(), is_npy=False)
+
+    assert array.shape == (*values.shape, 3)
+    numpy.testing.assert_array_equal(array[..., 0], values)